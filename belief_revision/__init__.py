@@ -0,0 +1,66 @@
+'''
+
+EXPLANATION ON HOW TO INSERT FORMULAS CORRECTLY IN THE BELIEFSET
+
+All the variables should be lowercase letters from the alphabet except for 'v' (v is used for 'or' operations)
+A letter can be followed by a number to have more than 26 variables (like 'p1', 'p2', 'q12',...)
+
+If the formula is something simple, like 'p', '¬q', 'p -> q',..., then no parenthesis are needed.
+This simple formulas are: (please make sure the spaces are written correctly)
+1. Proposition: 'p'
+2. Negation: '¬p'
+3. Implication: 'p -> q', '¬p -> q', 'p -> ¬q', '¬p -> ¬q'
+4. Disjunction: 'p v q'
+5. Conjuntion: 'p ^ q'
+6. If and only if: 'p <-> q'
+
+If more complex formulas are written, then parenthesis are needed.
+This more complex formulas are: (note that x and y can be any of the simple formulas)
+7. Complex negation: '¬(x)'
+8. Complex implication: '(x) -> (y)'
+9. Complex disjunction: '(x) v (y)'
+10. Complex conjuntion: '(x) ^ (y)'
+11. Complex if and only if: '(x) <-> (y)'
+
+'''
+
+####################################################################################
+
+# The package is split in modules (parser, store, bitset, models, incremental, ranked, components, sat, beliefset,
+# entailment, postulates, snapshot, stats). The streaming pipeline (stream) and the query server (server) are not
+# imported here, they are imported (or run) on their own
+# Importing it only defines the functions and classes: the patterns are compiled the first time they are used,
+# the worker processes are started by the first parallel check and the examples are in __main__.py
+# (python -m belief_revision)
+
+from .parser import (compile_formula, evaluate, well_defined, canonical_tree, canonical_formula, complement_of)
+from .store import BeliefStore
+from .bitset import (variables_of, formula_variables, variable_masks, formula_mask, bitset_beliefset,
+                     bitset_query, parallel_beliefset)
+from .models import ModelSet
+from .incremental import IncrementalModels
+from .ranked import RankedModels
+from .components import components_of, component_beliefset, ComponentModels
+from .sat import SatSolver, TseitinEncoder, sat_beliefset, sat_query, sat_entailment
+from .beliefset import BeliefSet
+from .entailment import PreparedBase, Entailment, compare_models
+from .postulates import postulate_violations, check_postulates
+from .snapshot import Snapshot, dump_snapshot, save_snapshot, load_snapshot
+from .stats import Stats
+
+__all__ = [
+    'compile_formula', 'evaluate', 'well_defined', 'canonical_tree', 'canonical_formula', 'complement_of',
+    'BeliefStore',
+    'variables_of', 'formula_variables', 'variable_masks', 'formula_mask', 'bitset_beliefset', 'bitset_query',
+    'parallel_beliefset',
+    'ModelSet',
+    'IncrementalModels',
+    'RankedModels',
+    'components_of', 'component_beliefset', 'ComponentModels',
+    'SatSolver', 'TseitinEncoder', 'sat_beliefset', 'sat_query', 'sat_entailment',
+    'BeliefSet',
+    'PreparedBase', 'Entailment', 'compare_models',
+    'postulate_violations', 'check_postulates',
+    'Snapshot', 'dump_snapshot', 'save_snapshot', 'load_snapshot',
+    'Stats',
+]
@@ -0,0 +1,93 @@
+from .beliefset import BeliefSet
+from .entailment import Entailment
+
+####################################################################################
+
+# LET'S SEE SOME EXAMPLES
+# They are run with python -m belief_revision (or python Assignment2_IntroToAI.py), not when the package is imported
+
+def main():
+    # EXAMPLES IN THE BELIEFSET 
+
+    bs = BeliefSet()
+    print('The beliefset is:',bs.returnset())
+    proposition,priority = 'p',0
+    bs.expansion(bs.beliefset, proposition,priority)
+    print('The beliefset after expanding the proposition',proposition,'with priority',priority,'is:',bs.returnset())
+
+    proposition,priority = '¬q',1
+    bs.expansion(bs.beliefset, proposition,priority)
+    print('The beliefset after expanding the proposition',proposition,'with priority',priority,'is:',bs.returnset())
+
+    proposition,priority = 'p -> r',2
+    bs.expansion(bs.beliefset, proposition,priority)
+    print('The beliefset after expanding the proposition',proposition,'with priority',priority,'is:',bs.returnset())
+
+    proposition,priority = 'r -> q',1
+    bs.expansion(bs.beliefset, proposition,priority)
+    print('The beliefset after expanding the proposition',proposition,'with priority',priority,'is:',bs.returnset())
+
+    proposition,priority = '(p v r) -> (q)',0
+    bs.expansion(bs.beliefset, proposition,priority)
+    print('The beliefset after expanding the proposition',proposition,'with priority',priority,'is:',bs.returnset())
+
+    proposition = '¬q'
+    bs.contraction(bs.beliefset, proposition)
+    print('The beliefset after contracting the proposition',proposition,'is:',bs.returnset())
+
+    proposition,priority = '¬p',0
+    bs.revision(bs.beliefset, proposition,priority)
+    print('The beliefset after revising the proposition',proposition,'with priority',priority,'is:',bs.returnset())
+
+    proposition,priority = 'r -> p',1
+    bs.revision(bs.beliefset, proposition,priority)
+    print('The beliefset after revising the proposition',proposition,'with priority',priority,'is:',bs.returnset())
+
+    proposition,priority = 'r -> ¬r',2
+    bs.expansion(bs.beliefset,  proposition,priority)
+    print('The beliefset after expanding the proposition',proposition,'with priority',priority,'is:',bs.returnset())
+
+    proposition,priority = 'r',1
+    bs.expansion(bs.beliefset, proposition,priority)
+    print('The beliefset after expanding the proposition',proposition,'with priority',priority,'is:',bs.returnset())
+    print('\n')
+
+
+    # EXAMPLES WITH THE POSTULATES
+
+    #AGM Postulates
+    # If postulates are correct they return None, else print an error
+    print('Let\'s check the AGM Postulates')
+    agm1 = bs.contraction_success(bs.beliefset, 'r')
+    agm2 = bs.contraction_inclusion(bs.beliefset, 'r')
+    agm3 = bs.contraction_vacuity(bs.beliefset, 'r')
+    agm4 = bs.contraction_extensionality(bs.beliefset, 'r','q')
+
+    agm5 = bs.revision_success(bs.beliefset, 'r')
+    agm6 = bs.revision_inclusion(bs.beliefset, 'r')
+    agm7 = bs.revision_vacuity(bs.beliefset, 'r')
+    agm8 = bs.revision_consistency(bs.beliefset, 'r')
+    agm9 = bs.revision_extensionality(bs.beliefset, 'r','q')
+    print('The postulates are correct' if all(var is None for var in [agm1,agm2,agm3,agm4,agm5,agm6,agm7,agm8,agm9]) else 'There is at least one error')
+    print('\n')
+
+
+    # EXAMPLES WITH THE ENTAILMENT
+
+    print('Now let\'s check the entailment')
+    et = Entailment()
+
+    formula, beliefset = '¬r -> ¬p',['p', '¬r', 'q -> r','q']
+    entailment = et.check_entailment(formula,beliefset)
+    print('The entailement with formula',formula,'and beliefset',beliefset,'is',entailment)
+
+    formula, beliefset = 'q <-> r',['p', '¬r', 'q -> r']
+    entailment = et.check_entailment(formula,beliefset)
+    print('The entailement with formula',formula,'and beliefset',beliefset,'is',entailment)
+
+    formula, beliefset = 'q -> r',['q','r']
+    entailment = et.check_entailment(formula,beliefset)
+    print('The entailement with formula',formula,'and beliefset',beliefset,'is',entailment)
+
+if __name__ == '__main__':
+    main()
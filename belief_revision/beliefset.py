@@ -0,0 +1,334 @@
+import itertools
+
+from .parser import pattern_iff2, regex, compile_formula, evaluate, well_defined, complement_of
+from .store import BeliefStore
+from .bitset import variables_of, bitset_beliefset, parallel_beliefset
+from .components import component_beliefset
+from .models import ModelSet
+from .incremental import IncrementalModels
+from .ranked import RankedModels
+from .sat import sat_beliefset, sat_models_to_dicts
+from .stats import Stats, instrumented
+
+####################################################################################
+
+class BeliefSet():
+    def __init__(self, engine='bitset', incremental=False, workers=0, chunk_size=1 << 16, partition=False):
+        # Initialize belief set as an empty store (it works like a list, see BeliefStore)
+        self.beliefset = BeliefStore()
+        # 'bitset' evaluates every formula on all the assignments at once, 'truthtable' uses a list of dicts
+        # and 'sat' uses a SAT solver (for beliefsets with many variables)
+        if engine not in ('bitset', 'truthtable', 'sat'):
+            raise ValueError('Unknown engine: ' + str(engine))
+        self.engine = engine
+        # With incremental=True the models are kept between calls and only the part of the beliefset that changed is checked again
+        if incremental and engine != 'bitset':
+            raise ValueError('Only the bitset engine can be incremental')
+        self.incremental = IncrementalModels() if incremental else None
+        # With workers > 0 the bitset engine splits the assignments in chunks of chunk_size (a power of 2)
+        # and checks them in that number of processes
+        if workers and engine != 'bitset':
+            raise ValueError('Only the bitset engine can use workers')
+        if chunk_size < 1 or chunk_size & (chunk_size - 1):
+            raise ValueError('The chunk size must be a power of 2')
+        self.workers = workers
+        self.chunk_bits = chunk_size.bit_length() - 1
+        self.executor = None
+        # With partition=True the beliefs that don't share variables are checked apart (see component_beliefset),
+        # and with workers the components with more than chunk_size assignments are checked in the processes
+        if partition and (engine != 'bitset' or incremental):
+            raise ValueError('Only the bitset engine (not incremental) can be partitioned')
+        self.partition = partition
+        # Masks of the beliefs by priority for ranked_revision and ranked_contraction (they always use truth tables)
+        self.ranked = RankedModels()
+        # Counters and timers of the operations (see instrument), None if they are not kept
+        self.stats = None
+        self.work = None
+
+    # Keep counters and timers for every operation (see Stats), fn(stats) is called for every callback when an
+    # operation finishes. It returns the Stats (self.stats = None stops it)
+    def instrument(self, *callbacks):
+        if self.stats is None:
+            self.stats = Stats()
+        for fn in callbacks:
+            self.stats.add_callback(fn)
+        return self.stats
+
+    # Expand the beliefset by inserting a proposition at a specified priority
+    @instrumented(formula=1)
+    def expansion(self, beliefset, proposition, priority):
+        # Checks if the proposition is well defined first (an equivalent belief doesn't make it well defined)
+        if not self.is_well_defined(proposition):
+            raise ValueError('This formula is not written correctly')
+        if proposition not in beliefset:
+            if self.stats is None:
+                beliefset.insert(priority, proposition)
+            else:
+                with self.stats.phase('store'):
+                    beliefset.insert(priority, proposition)
+            self.beliefset = self.check_consistency(beliefset)  # Checks if the beliefset is consistent with the new proposition inside
+            return self.beliefset
+        else:
+            return self.beliefset
+                
+    # Contract the belief set by removing a proposition if it exists
+    @instrumented(formula=1)
+    def contraction(self, beliefset, proposition):
+        if proposition in beliefset:
+            if self.stats is None:
+                beliefset.remove(proposition)
+            else:
+                with self.stats.phase('store'):
+                    beliefset.remove(proposition)
+                self.stats.count('beliefs_dropped', 1)
+        return beliefset
+    
+    # Revise the belief set with a new proposition at a specified priority
+    @instrumented(formula=1)
+    def revision(self, beliefset, proposition, priority):
+        proposition2 = complement_of(proposition)
+        if self.is_well_defined(proposition):
+            if proposition2 in beliefset:
+                beliefset = self.contraction(beliefset, proposition2)
+            self.beliefset = self.expansion(beliefset, proposition, priority)
+        return self.beliefset
+
+    # Revise the belief set with a formula at a specified priority, giving up only the least entrenched beliefs
+    # (the last ones) that are not consistent with it and with the beliefs before them (see RankedModels)
+    @instrumented(formula=1)
+    def ranked_revision(self, beliefset, proposition, priority):
+        if not self.is_well_defined(proposition):
+            raise ValueError('This formula is not written correctly')
+        if self.stats is None:
+            self.beliefset = self.ranked.revise(beliefset, proposition, priority)
+        else:
+            with self.stats.phase('ranked'):
+                self.beliefset = self.ranked.revise(beliefset, proposition, priority)
+            self.stats.count('beliefs_dropped', self.ranked.dropped)
+        return self.beliefset
+
+    # Contract the belief set by giving up the least entrenched beliefs until it doesn't entail the formula
+    @instrumented(formula=1)
+    def ranked_contraction(self, beliefset, proposition):
+        if self.stats is None:
+            return self.ranked.contract(beliefset, proposition)
+        with self.stats.phase('ranked'):
+            beliefset = self.ranked.contract(beliefset, proposition)
+        self.stats.count('beliefs_dropped', self.ranked.dropped)
+        return beliefset
+
+    # AGM Postulates
+    def contraction_success(self, belset, prop):
+        new_contraction = self.contraction(belset, prop)
+        return None if prop not in new_contraction else ValueError('Error in AGM Contraction - Success')
+
+    def contraction_inclusion(self, belset, prop):
+        new_contraction = self.contraction(belset,prop)
+        for bel in new_contraction: 
+            if bel not in belset:
+                return ValueError('Error in AGM Contraction - Inclusion')
+    
+    def contraction_vacuity(self, belset, prop):
+        new_contraction = self.contraction(belset, prop)
+        _, true_false = self.check_beliefset(belset)
+        if not self.check2([prop], true_false):
+            return None if belset == new_contraction else ValueError('Error in AGM Contraction - Vacuity')
+    
+    def contraction_extensionality(self, belset, prop1, prop2):
+        iff = prop1 + ' <-> ' + prop2
+        if regex(pattern_iff2).match(iff) and iff in belset: 
+            return None if self.contraction(belset, prop1) == self.contraction(belset, prop2) else ValueError('Error in AGM Contraction - Extensionality')
+    
+    def revision_success(self, belset, prop):
+        new_revision = self.revision(belset, prop, 0)
+        return None if prop in new_revision else ValueError('Error in AGM Revision - Success')
+    
+    def revision_inclusion(self, belset1, prop):
+        return None if all(x in  self.expansion(belset1, prop,0) for x in self.revision(belset1, prop, 0)) else ValueError('Error in AGM Revision - Inclusion')
+
+    def revision_vacuity(self, belset, prop):
+        if '¬' + prop not in belset:
+            return None if self.revision(belset, prop, 0) == self.expansion(belset, prop,0) else ValueError('Error in AGM Revision - Vacuity')
+
+    def revision_consistency(self, belset, prop):
+        b_add, _ = self.check_beliefset(belset)
+        if not b_add == []:
+            bb_add, _ = self.check_beliefset(self.revision(belset, prop, 0))
+            return None if prop in bb_add else ValueError('Error in AGM Revision - Consistency')
+
+    def revision_extensionality(self, belset, prop1, prop2):
+        iff = prop1 + ' <-> ' + prop2
+        if regex(pattern_iff2).match(iff) and iff in belset: 
+            return None if self.contraction(belset, prop1) == self.contraction(belset, prop2) else ValueError('Error in AGM Revision - Extensionality')
+
+
+    # This is an auxiliar function that, given a single beliefset and a dict (like beliefset = 'q' & dic1 = [p:False, q:True, R:True]),
+    # checks if beliefset can be satisfied with the values in dic1 (in that case, beliefset can be satisfies with q:True so it will return True)
+    def check2(self, beliefset, dic1):
+        _ , dict = self.check_beliefset(beliefset)
+        dict = dict[0]
+        for d in dict:
+            for d_d in dic1:
+                if dict[d] != d_d[d]:
+                    return False
+        return True
+            
+    
+    # Check if the given formula is well defined
+    def is_well_defined(self, formula):
+        return well_defined(formula)
+    
+    # Clear the belief set
+    def empty(self):
+        self.beliefset = BeliefStore()
+
+    # Return the current belief set
+    def returnset(self):
+        return self.beliefset
+
+    # Get the truth value of a formula (elem) based on a truth assignment (n_dic)
+    # The formula is parsed only once (see compile_formula) and then the tree is evaluated
+    def get(self, elem, n_dic):
+        return evaluate(compile_formula(elem), n_dic)
+
+    # See if the beliefset is consistent and if not, remove the inconsistent formulas
+    # This function takes as an input a beliefset (like ['p','¬q','p -> q', 'p -> r']) and returns 2 things:
+    # 1. First, it returns the consistent beliefset (in that case it will return ['p','¬q', 'p -> r'], since 'p -> q' is not consistent with p and ¬q)
+    # 2. It will return the value of each element (in that case it will return {p:True, q:False, r:True})
+
+    @instrumented
+    def check_beliefset(self, n_beliefset):
+        if self.stats is None:
+            return self.check_models(n_beliefset)
+        return self.measure(self.check_models, n_beliefset)
+
+    # Same as check_beliefset, but it only returns the consistent beliefset (the models are not listed)
+    @instrumented
+    def check_consistency(self, n_beliefset):
+        if self.stats is None:
+            return self.consistent_beliefs(n_beliefset)
+        return self.measure(self.consistent_beliefs, n_beliefset)
+
+    # Run check (check_models, consistent_beliefs or any function that checks a beliefset and returns the
+    # consistent beliefset, alone or first in a tuple) and count in self.stats what it did: the formulas are parsed
+    # first (in their own phase) and the engine puts in self.work the number of assignments where it evaluated
+    # a formula, the number of assignments and the number of models that are left
+    def measure(self, check, n_beliefset):
+        stats = self.stats
+        with stats.phase('parse'):
+            for elem in n_beliefset:
+                stats.parse(elem)
+        self.work = (0, 0, 0)
+        if self.incremental is not None:
+            engine = 'incremental'
+        elif self.partition:
+            engine = 'components'
+        else:
+            engine = self.engine
+        with stats.phase(engine):
+            result = check(n_beliefset)
+        beliefset = result[0] if isinstance(result, tuple) else result
+        stats.count('beliefs_dropped', len(n_beliefset) - len(beliefset))
+        evaluated, size, left = self.work
+        stats.count('assignments_evaluated', evaluated)
+        stats.count('models_pruned', size - left)
+        return result
+
+    # check_beliefset without the stats
+    def check_models(self, n_beliefset):
+        if self.incremental is not None:
+            beliefset = self.incremental.check(n_beliefset)
+            if self.stats is not None:
+                self.work = self.incremental.work()
+            return beliefset, self.incremental.model_set()
+        if self.partition:
+            beliefset, models = self.component_beliefset(n_beliefset)
+            return beliefset, models.model_set()
+        if self.engine == 'bitset':
+            beliefset, models, variables = self.bitset_beliefset(n_beliefset)
+            return beliefset, ModelSet(models, variables[::-1], variables)
+        if self.engine == 'sat':
+            beliefset, solver, encoder, variables, last_model = sat_beliefset(n_beliefset)
+            return beliefset, sat_models_to_dicts(solver, encoder, variables, last_model)
+
+        beliefset = n_beliefset.copy()
+        dic = {}
+
+        for var in variables_of(n_beliefset):  # Letters and numbered variables (like 'p1'), without 'v'
+            dic[var] = []
+
+        # Generate all possible combinations of truth values for each proposition
+        combinations = list(itertools.product([False, True], repeat=len(dic)))
+
+        # Create a list of dictionaries with each combination
+        list_of_dicts = [{k: v for k, v in zip(dic.keys(), combo)} for combo in combinations]
+        # If the beliefset contains the variables p and q, then list_of_dicts = [{p:True,q:True},{p:True,q:False},...]
+
+        list_copy = list_of_dicts.copy()
+        evaluated = 0
+
+        for elem in n_beliefset:
+            corroboration = []
+            tree = compile_formula(elem)
+
+            for d in list_copy:    
+                if d in list_of_dicts:    
+                    f = evaluate(tree, d)
+                    corroboration.append(f)
+                    if f == False and len(list_of_dicts) > 1:
+                        list_of_dicts.remove(d)
+
+            evaluated += len(corroboration)
+            if all(not x for x in corroboration):
+                beliefset.remove(elem)
+
+        if self.stats is not None:
+            self.work = (evaluated, len(combinations), len(list_of_dicts))
+        return beliefset, list_of_dicts
+
+    # check_consistency without the stats
+    def consistent_beliefs(self, n_beliefset):
+        if self.incremental is not None:
+            beliefset = self.incremental.check(n_beliefset)
+            if self.stats is not None:
+                self.work = self.incremental.work()
+            return beliefset
+        if self.partition:
+            return self.component_beliefset(n_beliefset)[0]
+        if self.engine == 'bitset':
+            return self.bitset_beliefset(n_beliefset)[0]
+        if self.engine == 'sat':
+            return sat_beliefset(n_beliefset)[0]
+        return self.check_models(n_beliefset)[0]
+
+    # Models of the beliefset with the bitset engine (in parallel if there are workers)
+    def bitset_beliefset(self, n_beliefset):
+        if not self.workers:
+            result = bitset_beliefset(n_beliefset)
+        else:
+            result = parallel_beliefset(n_beliefset, self.processes(), self.workers, self.chunk_bits)
+        if self.stats is not None:
+            size = 1 << len(result[2])
+            self.work = (len(n_beliefset) * size, size, bin(result[1]).count('1'))
+        return result
+
+    # Models of the beliefset split in components (a ComponentModels), with the processes if there are workers
+    def component_beliefset(self, n_beliefset):
+        result = component_beliefset(n_beliefset, self.processes() if self.workers else None, self.chunk_bits)
+        if self.stats is not None:
+            self.work = result[1].work()
+        return result
+
+    # The pool of processes of the workers
+    def processes(self):
+        if self.executor is None:
+            # The processes (and the multiprocessing module) are only started when they are needed
+            from concurrent.futures import ProcessPoolExecutor
+            self.executor = ProcessPoolExecutor(self.workers)
+        return self.executor
+
+    # Stop the processes of the workers (if there are any)
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
@@ -0,0 +1,215 @@
+from functools import lru_cache
+
+from .parser import pattern_variable, regex, evaluate, canonical_formula
+
+####################################################################################
+
+# BITSET ENGINE
+# The truth assignments of n variables are numbered like in itertools.product([False, True], repeat=n),
+# so the first variable is the most significant bit (assignment 0 is all False, assignment 2^n - 1 is all True)
+# A set of assignments (a set of models) is a python int where the bit i is 1 if the assignment i is in the set,
+# so removing the models where a formula is False is just an & with the mask of the formula
+
+# Variables of a beliefset in order of appearance (the same ones check_beliefset uses)
+def variables_of(beliefset):
+    dic = {}
+    for elem in beliefset:
+        for var in regex(pattern_variable).findall(elem):
+            if var not in dic and var != 'v':
+                dic[var] = None
+    return list(dic)
+
+# Variables of a single formula (cached, like the trees)
+@lru_cache(maxsize=1 << 16)
+def formula_variables(elem):
+    return tuple(variables_of([elem]))
+
+# Mask of the bit k (the assignments where the bit k is 1) when there are size assignments
+def bit_mask(k, size):
+    half = 1 << k
+    mask = ((1 << half) - 1) << half
+    length = half << 1
+    while length < size:
+        mask |= mask << length
+        length <<= 1
+    return mask
+
+# Mask of every variable (the assignments where it is True), as a dict {variable: mask}
+def variable_masks(variables):
+    n = len(variables)
+    size = 1 << n
+    # The variable k is the bit n-1-k of the assignment
+    return {var: bit_mask(n - 1 - k, size) for k, var in enumerate(variables)}
+
+# Copy a set of models from size assignments to new_size assignments
+# (the new variables are the highest bits, and they can have any value)
+def extend_models(models, size, new_size):
+    while size < new_size:
+        models |= models << size
+        size <<= 1
+    return models
+
+# Mask of a tree (the assignments where the formula is True)
+# With a dict (memo), the masks of the subtrees are kept there, so a subtree that appears again is not evaluated again
+def formula_mask(tree, masks, full, memo=None):
+    if memo is not None and tree in memo:
+        return memo[tree]
+    op = tree[0]
+    if op == 'var':
+        mask = masks[tree[1]]
+    elif op == '¬':
+        mask = full ^ formula_mask(tree[1], masks, full, memo)
+    elif op == '?':
+        mask = full
+    else:
+        left = formula_mask(tree[1], masks, full, memo)
+        right = formula_mask(tree[2], masks, full, memo)
+        if op == '->':
+            mask = (full ^ left) | right
+        elif op == 'v':
+            mask = left | right
+        elif op == '^':
+            mask = left & right
+        else:
+            mask = full ^ (left ^ right)
+    if memo is not None:
+        memo[tree] = mask
+    return mask
+
+# Same as BeliefSet.check_beliefset, but the models are a bitset
+# It returns the consistent beliefset, the models and the variables (in the order of the bits)
+# If a formula is False in all the models left, the formula is removed and only the last model is kept
+# (exactly what the loop over the list of dicts does)
+def bitset_beliefset(n_beliefset):
+    beliefset = n_beliefset.copy()
+    variables = variables_of(n_beliefset)
+    masks = variable_masks(variables)
+    full = (1 << (1 << len(variables))) - 1
+    models = full
+    memo = {}
+    for elem in n_beliefset:
+        survivors = models & formula_mask(canonical_formula(elem), masks, full, memo)
+        if survivors:
+            models = survivors
+        else:
+            models = 1 << (models.bit_length() - 1)
+            beliefset.remove(elem)
+    return beliefset, models, variables
+
+# Swap the bits a and b (a < b) of every assignment in a set of models
+def swap_bits(models, a, b, size):
+    mask_a, mask_b = bit_mask(a, size), bit_mask(b, size)
+    up = mask_a & ~mask_b    # bit a is 1 and bit b is 0
+    down = mask_b & ~mask_a  # bit a is 0 and bit b is 1
+    shift = (1 << b) - (1 << a)
+    return (models & ~(up | down)) | ((models & up) << shift) | ((models & down) >> shift)
+
+# Remove the bit k from every assignment in a set of models (the variable can have any value)
+def remove_bit(models, k, size):
+    mask = bit_mask(k, size)
+    models = (models & ~mask) | ((models & mask) >> (1 << k))
+    # Now the models are in the first half of every block of 2^(k+1) assignments, so the
+    # blocks are moved together: first in pairs, then in groups of 4,...
+    step = 1 << k
+    bit = k + 1
+    while (1 << bit) < size:
+        mask = bit_mask(bit, size)
+        models = (models & ~mask) | ((models & mask) >> step)
+        step <<= 1
+        bit += 1
+    return models
+
+# Check the entailment of a formula with the models of a beliefset (masks are the masks of its variables, size the number of assignments)
+# The variables of the formula that are not in the beliefset are added as the highest bits,
+# so the models of the beliefset only have to be copied once for every new variable
+# The copies can be kept in a dict (cache) when many formulas are checked with the same models
+def bitset_query(formula, models, masks, size, cache=None):
+    variables = formula_variables(formula)
+    extra = [var for var in variables if var not in masks]
+    new_size = size << len(extra)
+    if cache is None:
+        cache = {}
+    if new_size not in cache:
+        cache[new_size] = extend_models(models, size, new_size)
+    models = cache[new_size]
+    n = size.bit_length() - 1
+    query_masks = {}
+    for var in variables:
+        if var in masks:
+            if (var, new_size) not in cache:
+                cache[var, new_size] = extend_models(masks[var], size, new_size)
+            query_masks[var] = cache[var, new_size]
+        else:
+            query_masks[var] = bit_mask(n + extra.index(var), new_size)
+    full = (1 << new_size) - 1
+    formula_models = formula_mask(canonical_formula(formula), query_masks, full)
+    if not formula_models:  # If the formula is never True, check_beliefset keeps the last model (everything True)
+        formula_models = full
+        for var in variables:
+            formula_models &= query_masks[var]
+    return models & formula_models != 0
+
+####################################################################################
+
+# PARALLEL BITSET ENGINE
+# The assignments are split in chunks of 2^chunk_bits assignments (the chunk c has the assignments
+# c*2^chunk_bits ... (c+1)*2^chunk_bits - 1) and every chunk is checked in a different process
+# Inside a chunk, the variables of the highest bits have always the same value
+
+# Check the beliefs (trees) in the chunks first_chunk ... last_chunk - 1
+# For every chunk it returns (j, models): j is the number of beliefs that are True in some model of the chunk
+# (together with the ones before them) and models are the models of the chunk that satisfy the first j beliefs
+def bitset_chunks(trees, variables, chunk_bits, first_chunk, last_chunk):
+    n = len(variables)
+    size = 1 << chunk_bits
+    full = (1 << size) - 1
+    low_masks = {var: bit_mask(n - 1 - k, size) for k, var in enumerate(variables) if n - 1 - k < chunk_bits}
+    results = []
+    for chunk in range(first_chunk, last_chunk):
+        start = chunk << chunk_bits
+        masks = dict(low_masks)
+        for k, var in enumerate(variables):
+            if n - 1 - k >= chunk_bits:
+                masks[var] = full if start >> (n - 1 - k) & 1 else 0
+        models, j = full, 0
+        memo = {}
+        for tree in trees:
+            survivors = models & formula_mask(tree, masks, full, memo)
+            if not survivors:
+                break
+            models = survivors
+            j += 1
+        results.append((j, models))
+    return results
+
+# Same as bitset_beliefset, but the chunks are checked in the processes of executor
+# The first belief that is False in all the chunks is the first one that the serial loop removes, so the
+# models are the ones of the chunks that got to that belief. From there only the last model is left,
+# so the rest of the beliefs are just evaluated in that model
+def parallel_beliefset(n_beliefset, executor, workers, chunk_bits):
+    variables = variables_of(n_beliefset)
+    n = len(variables)
+    if n <= chunk_bits:
+        return bitset_beliefset(n_beliefset)
+    trees = [canonical_formula(elem) for elem in n_beliefset]
+    chunks = 1 << (n - chunk_bits)
+    tasks = min(chunks, 4 * workers)  # A few tasks for every process, so they all finish at the same time
+    bounds = [chunks * t // tasks for t in range(tasks + 1)]
+    futures = [executor.submit(bitset_chunks, trees, variables, chunk_bits, bounds[t], bounds[t + 1]) for t in range(tasks)]
+    results = [result for future in futures for result in future.result()]
+
+    length = max(j for j, _ in results)
+    models = 0
+    for chunk, (j, chunk_models) in enumerate(results):
+        if j == length:
+            models |= chunk_models << (chunk << chunk_bits)
+    beliefset = n_beliefset.copy()
+    if length < len(trees):
+        beliefset.remove(n_beliefset[length])
+        models = 1 << (models.bit_length() - 1)
+        last = models.bit_length() - 1
+        last_model = {var: bool(last >> (n - 1 - k) & 1) for k, var in enumerate(variables)}
+        for elem, tree in zip(n_beliefset[length + 1:], trees[length + 1:]):
+            if not evaluate(tree, last_model):
+                beliefset.remove(elem)
+    return beliefset, models, variables
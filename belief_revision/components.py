@@ -0,0 +1,156 @@
+from .parser import canonical_formula
+from .bitset import formula_variables, bit_mask, variable_masks, formula_mask, bitset_query
+from .models import ModelSet
+
+####################################################################################
+
+# INDEPENDENT COMPONENTS
+# Beliefs that don't share any variable (like p, p -> q and r v s) don't change the models of each other, so
+# the beliefset is split in components (the beliefs that share variables, directly or through other beliefs,
+# found with a union-find over the variables) and every component has its own bitset of models: a beliefset
+# with components of k1, k2,... variables needs 2^k1 + 2^k2 + ... assignments instead of 2^(k1 + k2 + ...)
+# The models of the beliefset are all the combinations of the models of the components (their product)
+# The beliefs are still checked in their order: when a belief is False in all the models left, check_beliefset
+# keeps only the last model of all the variables, which is the last model of every component, so all the
+# components are reduced to their last model at that moment
+
+# Components of a beliefset: it returns all the variables (in the order of check_beliefset) and, for every
+# component, its variables (in the same order) and the positions of its beliefs
+# The beliefs without variables are not in any component (they are True in every model)
+def components_of(n_beliefset):
+    parent, size, variables = {}, {}, {}
+    def find(var):
+        while parent[var] != var:
+            parent[var] = parent[parent[var]]  # Path halving
+            var = parent[var]
+        return var
+    for elem in n_beliefset:
+        formula = formula_variables(elem)
+        for var in formula:
+            if var not in parent:
+                parent[var], size[var], variables[var] = var, 1, None
+        for var in formula[1:]:
+            a, b = find(formula[0]), find(var)
+            if a != b:
+                if size[a] < size[b]:  # The smaller tree goes under the bigger one
+                    a, b = b, a
+                parent[b] = a
+                size[a] += size[b]
+
+    components, index = [], {}
+    for var in variables:  # In order of appearance
+        root = find(var)
+        if root not in index:
+            index[root] = len(components)
+            components.append(([], []))
+        components[index[root]][0].append(var)
+    for i, elem in enumerate(n_beliefset):
+        formula = formula_variables(elem)
+        if formula:
+            components[index[find(formula[0])]][1].append(i)
+    return list(variables), components
+
+# Models of a component after its beliefs (trees), stopping at the first one that is False in all the models left
+# It returns the number of beliefs checked before that one and the models of those beliefs
+def component_prefix(trees, variables):
+    masks = variable_masks(variables)
+    full = (1 << (1 << len(variables))) - 1
+    models, memo = full, {}
+    for j, tree in enumerate(trees):
+        survivors = models & formula_mask(tree, masks, full, memo)
+        if not survivors:
+            return j, models
+        models = survivors
+    return len(trees), models
+
+# Same as bitset_beliefset, but every component is checked on its own
+# It returns the consistent beliefset and the models (a ComponentModels)
+# With an executor, the components with more than chunk_bits variables are checked in its processes until their
+# first belief that is False in all their models. The first of those beliefs is the first one that the serial loop
+# removes, so the components are checked again (only the ones that have beliefs after it) up to that belief,
+# and from there the loop goes on with the last model of every component
+def component_beliefset(n_beliefset, executor=None, chunk_bits=16):
+    order, components = components_of(n_beliefset)
+    trees = [canonical_formula(elem) for elem in n_beliefset]
+    owner = {i: c for c, (_, positions) in enumerate(components) for i in positions}
+    states = [None] * len(components)
+    start, evaluated = 0, 0
+    if executor is not None:
+        big = [c for c, (variables, _) in enumerate(components) if len(variables) > chunk_bits]
+        if big:
+            futures = {c: executor.submit(component_prefix, [trees[i] for i in components[c][1]], components[c][0])
+                       for c in big}
+            prefixes = [futures[c].result() if c in futures else
+                        component_prefix([trees[i] for i in positions], variables)
+                        for c, (variables, positions) in enumerate(components)]
+            start = min((positions[j] for (_, positions), (j, _) in zip(components, prefixes) if j < len(positions)),
+                        default=len(trees))
+            for c, ((variables, positions), (j, models)) in enumerate(zip(components, prefixes)):
+                before = sum(1 for i in positions if i < start)
+                if before != j:  # It got further than the first belief that is removed
+                    j, models = component_prefix([trees[i] for i in positions[:before]], variables)
+                states[c] = models
+                evaluated += before << len(variables)
+
+    masks, fulls, memos = [], [], []
+    for c, (variables, _) in enumerate(components):
+        masks.append(variable_masks(variables))
+        fulls.append((1 << (1 << len(variables))) - 1)
+        memos.append({})
+        if states[c] is None:
+            states[c] = fulls[c]
+    beliefset = n_beliefset.copy()
+    for i in range(start, len(trees)):
+        if i not in owner:
+            continue
+        c = owner[i]
+        survivors = states[c] & formula_mask(trees[i], masks[c], fulls[c], memos[c])
+        evaluated += 1 << len(components[c][0])
+        if survivors:
+            states[c] = survivors
+        else:
+            states = [1 << (models.bit_length() - 1) for models in states]
+            beliefset.remove(n_beliefset[i])
+    models = ComponentModels([(variables, models) for (variables, _), models in zip(components, states)], order)
+    models.evaluated = evaluated
+    return beliefset, models
+
+# The models of a beliefset split in components: components is a list of (variables, models), where the models
+# are a bitset of those variables (the first variable is the most significant bit, like in the bitset engine),
+# and variables are all the variables in the order of check_beliefset
+class ComponentModels():
+    def __init__(self, components, variables):
+        self.components = components
+        self.variables = variables
+        self.owner = {var: c for c, (variables, _) in enumerate(components) for var in variables}
+        self.merged = {}      # {components: (models, masks, size, cache)} for the queries
+        self.evaluated = 0    # Assignments where the check evaluated a formula (see BeliefSet.measure)
+
+    # What the check did: the assignments where a formula was evaluated, the number of assignments of all the
+    # components and their models
+    def work(self):
+        size = sum(1 << len(variables) for variables, _ in self.components)
+        return self.evaluated, size, sum(bin(models).count('1') for _, models in self.components)
+
+    # Product of the models of some components (a ModelSet)
+    def product(self, components):
+        product = ModelSet(1, [])
+        for c in components:
+            variables, models = self.components[c]
+            product = product & ModelSet(models, variables[::-1], variables)
+        return product
+
+    # All the models, like check_beliefset returns them
+    def model_set(self):
+        table = self.variables[::-1]
+        return ModelSet(self.product(range(len(self.components))).reorder(table).models, table, self.variables)
+
+    # Check the entailment of a formula: only the components with some variable of the formula are used
+    # (the models of the other ones can be anything, since every component has some model)
+    def query(self, formula):
+        key = tuple(sorted({self.owner[var] for var in formula_variables(formula) if var in self.owner}))
+        if key not in self.merged:
+            product = self.product(key)
+            masks = {var: bit_mask(k, product.size) for k, var in enumerate(product.table)}
+            self.merged[key] = (product.models, masks, product.size, {})
+        return bitset_query(formula, *self.merged[key])
@@ -0,0 +1,136 @@
+from .parser import canonical_formula
+from .bitset import bit_mask, variable_masks, bitset_query
+from .sat import sat_beliefset, sat_query
+from .beliefset import BeliefSet
+from .stats import instrumented
+
+####################################################################################
+
+# A beliefset that is checked only once, to check the entailment of many formulas with it
+# The models of the beliefset are computed when it is created (with the engine of the BeliefSet bf)
+# and every formula is then checked against them, so nothing is computed again for the beliefset
+# If the models of the beliefset are already known (a ModelSet, like the one of a snapshot), they are used instead
+class PreparedBase():
+    def __init__(self, n_beliefset, bf=None, models=None):
+        if bf is None:
+            bf = BeliefSet()
+        self.bf = bf
+        self.engine = bf.engine
+        self.results = {}
+        if models is not None:
+            self.engine = 'bitset'
+            self.beliefset, self.models, self.size = n_beliefset, models.models, models.size
+            self.masks = {var: bit_mask(k, models.size) for k, var in enumerate(models.table)}
+        elif bf.partition:
+            self.engine = 'components'
+            self.beliefset, self.components = bf.component_beliefset(n_beliefset)
+        elif bf.incremental is not None:
+            self.beliefset = bf.incremental.check(n_beliefset)
+            if self.beliefset is n_beliefset:  # The same store when nothing is removed, and the caller can change it
+                self.beliefset = n_beliefset.copy()
+            self.models, self.masks, self.size = bf.incremental.current()
+        elif bf.engine == 'bitset':
+            self.beliefset, self.models, variables = bf.bitset_beliefset(n_beliefset)
+            self.masks, self.size = variable_masks(variables), 1 << len(variables)
+        elif bf.engine == 'sat':
+            self.beliefset, self.solver, self.encoder, self.variables, self.last_model = sat_beliefset(n_beliefset)
+        else:
+            self.beliefset, self.true_false = bf.check_beliefset(n_beliefset)
+        self.cache = {}  # Copies of the models and masks for the formulas with new variables (see bitset_query)
+
+    # The counters and timers are the ones of the BeliefSet (see BeliefSet.instrument)
+    @property
+    def stats(self):
+        return self.bf.stats
+
+    # Given a formula, checks the entailment with the beliefset
+    # The result is kept for the next time (for the formula and all the equivalent ones)
+    @instrumented(formula=0)
+    def check_entailment(self, formula):
+        key = canonical_formula(formula)
+        if key not in self.results:
+            if self.stats is None:
+                self.results[key] = self.query(formula)
+            else:
+                with self.stats.phase('query'):
+                    self.results[key] = self.query(formula)
+        return self.results[key]
+
+    # Entailment of a formula that is not in the results yet
+    def query(self, formula):
+        if self.engine == 'bitset':
+            return bitset_query(formula, self.models, self.masks, self.size, self.cache)
+        if self.engine == 'components':
+            return self.components.query(formula)
+        if self.engine == 'sat':
+            return sat_query(formula, self.solver, self.encoder, self.variables, self.last_model)
+        _, true_false_formula = self.bf.check_beliefset([formula])
+        return compare_models(true_false_formula, self.true_false)
+
+    # Checks the entailment of every formula, the results are given one by one (it's a generator)
+    def check_entailment_many(self, formulas):
+        for formula in formulas:
+            yield self.check_entailment(formula)
+
+# True if a model of the formula and a model of the beliefset have the same values for the variables they share
+def compare_models(true_false_formula, true_false_beliefset):
+    for tf in true_false_formula:
+        for tf_form in true_false_beliefset:
+            is_the_same = True
+            for key in tf:
+                if is_the_same == False:
+                    break
+                if key in tf_form and tf[key] != tf_form[key]:
+                    is_the_same = False
+            if is_the_same == True:
+                return True
+    return False
+
+####################################################################################
+
+class Entailment():
+    def __init__(self, engine='bitset', incremental=False, workers=0, chunk_size=1 << 16, partition=False):
+        self.beliefset = BeliefSet(engine, incremental, workers, chunk_size, partition)
+
+    # The counters and timers are the ones of the BeliefSet (see BeliefSet.instrument)
+    @property
+    def stats(self):
+        return self.beliefset.stats
+
+    def instrument(self, *callbacks):
+        return self.beliefset.instrument(*callbacks)
+
+    # Models of the beliefset with check (a method of the BeliefSet), counted in the stats if they are kept
+    def base_models(self, check, beliefset):
+        if self.stats is None:
+            return check(beliefset)
+        return self.beliefset.measure(check, beliefset)
+
+    # Given a formula and a beliefset, checks the entailment (see if the formula is True or False based on the beliefset)
+    @instrumented(formula=0)
+    def check_entailment(self,formula,beliefset):
+        bf = self.beliefset
+        if bf.incremental is not None:
+            self.base_models(bf.consistent_beliefs, beliefset)
+            return bitset_query(formula, *bf.incremental.current())
+        if bf.partition:  # Only the components with the variables of the formula are used
+            _, models = self.base_models(bf.component_beliefset, beliefset)
+            return models.query(formula)
+        if bf.engine == 'bitset':
+            _, models, variables = self.base_models(bf.bitset_beliefset, beliefset)
+            return bitset_query(formula, models, variable_masks(variables), 1 << len(variables))
+        if bf.engine == 'sat':
+            _, solver, encoder, variables, last_model = self.base_models(sat_beliefset, beliefset)
+            return sat_query(formula, solver, encoder, variables, last_model)
+        beliefset, true_false_beliefset = bf.check_beliefset(beliefset)
+        formula,true_false_formula = bf.check_beliefset([formula]) 
+        return compare_models(true_false_formula, true_false_beliefset)
+
+    # Check the beliefset only once, to check the entailment of many formulas with it (see PreparedBase)
+    def prepare(self, beliefset):
+        return PreparedBase(beliefset, self.beliefset)
+
+    # Given many formulas and a beliefset, checks the entailment of every formula
+    # The models of the beliefset are computed only once and the results are given one by one (it's a generator)
+    def check_entailment_many(self, formulas, beliefset):
+        return self.prepare(beliefset).check_entailment_many(formulas)
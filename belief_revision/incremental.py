@@ -0,0 +1,172 @@
+from .parser import canonical_formula
+from .store import BeliefStore
+from .bitset import variables_of, formula_variables, extend_models, formula_mask
+from .models import ModelSet
+
+####################################################################################
+
+# INCREMENTAL ENGINE
+# Expansions, contractions and revisions only change a part of the beliefset, so this engine keeps the models
+# after every prefix of the last beliefset it checked (and the mask of every formula) and only recomputes
+# the beliefs after the first one that changed
+# The variables are never renumbered: a new variable is always the highest bit, so the old masks are still valid
+# (they only have to be copied, see extend_models). The variables that are not used anymore are removed from
+# the models when they are returned, and when there are more of them than used ones everything is computed again
+
+class IncrementalModels():
+    def __init__(self):
+        self.table = []          # table[k] is the variable of the bit k
+        self.masks = {}          # {variable: (mask, size)}
+        self.count = {}          # {variable: number of beliefs where it appears}
+        self.size = 1            # Number of assignments
+        self.formula_masks = {}  # {canonical form: (mask, size)}
+        self.beliefs = []        # Last beliefset that was checked
+        self.evaluated = 0       # Beliefs that the last check evaluated
+        # states[j] = (models, size, kept, removed) after the first j beliefs, where kept says if the belief j-1
+        # was kept and removed if some belief was already removed (then there is only one model left)
+        self.states = [(1, 1, True, False)]
+        # The BeliefStore that the last check returned and its version. The beliefs before the first one that was
+        # removed (kept) are the same in that store and in beliefs
+        self.store = None
+        self.version = 0
+        self.kept = 0
+
+    def add_variable(self, var):
+        self.table.append(var)
+        self.masks[var] = (((1 << self.size) - 1) << self.size, self.size << 1)
+        self.size <<= 1
+
+    # Mask of a variable with the current number of assignments
+    def variable_mask(self, var):
+        mask, size = self.masks[var]
+        if size != self.size:
+            mask = extend_models(mask, size, self.size)
+            self.masks[var] = (mask, self.size)
+        return mask
+
+    # Mask of a formula with the current number of assignments (equivalent formulas share the mask)
+    def formula_bits(self, elem):
+        key = canonical_formula(elem)
+        if key in self.formula_masks:
+            mask, size = self.formula_masks[key]
+            if size != self.size:
+                mask = extend_models(mask, size, self.size)
+                self.formula_masks[key] = (mask, self.size)
+            return mask
+        masks = {var: self.variable_mask(var) for var in formula_variables(elem)}
+        mask = formula_mask(key, masks, (1 << self.size) - 1)
+        self.formula_masks[key] = (mask, self.size)
+        return mask
+
+    # Models of a state with the current number of assignments
+    # After a removal there is only the last model, where the new variables are True
+    def state_models(self, state):
+        models, size, _, removed = state
+        if removed:
+            return models << (self.size - size)
+        return extend_models(models, size, self.size)
+
+    # Last model (in the order of check_beliefset) of a set of models
+    def last_model(self, models, variables):
+        known = set(variables)
+        for var in list(variables) + [var for var in self.table if var not in known]:
+            survivors = models & self.variable_mask(var)
+            if survivors:
+                models = survivors
+        return models
+
+    # Same as check_beliefset, but it only recomputes the beliefs after the first one that changed
+    # If n_beliefset is the BeliefStore that the last check returned, the store knows the first position that changed
+    # (see BeliefStore.first_change), so only the beliefs from there are read. If no belief is removed the same
+    # store is returned, and if some are removed a copy without them
+    def check(self, n_beliefset):
+        old = self.beliefs
+        start = None
+        if n_beliefset is self.store:
+            start = n_beliefset.first_change(self.version)
+        if start is not None:
+            common = min(start, self.kept)
+            removed = old[common:]
+            del old[common:]
+            old.extend(n_beliefset.iterate(common))
+            new = old
+        else:
+            new = list(n_beliefset)  # A list is faster to index than a BeliefStore
+            common, limit = 0, min(len(old), len(new))
+            while common < limit and old[common] == new[common]:
+                common += 1
+            removed = old[common:]
+        for elem in removed:
+            for var in formula_variables(elem):
+                self.count[var] -= 1
+        for elem in new[common:]:
+            for var in formula_variables(elem):
+                if var not in self.masks:
+                    self.add_variable(var)
+                self.count[var] = self.count.get(var, 0) + 1
+        del self.states[common + 1:]
+        self.beliefs = new
+        self.evaluated = len(new) - common  # Beliefs that are checked again
+
+        live = sum(1 for var in self.table if self.count[var])
+        if len(self.table) - live > live:  # Too many variables that are not used anymore
+            self.__init__()
+            return self.check(n_beliefset)
+        if len(self.formula_masks) > 2 * len(new) + 64:
+            used = {canonical_formula(elem) for elem in new}
+            self.formula_masks = {elem: mask for elem, mask in self.formula_masks.items() if elem in used}
+
+        variables = None
+        for elem in new[common:]:
+            state = self.states[-1]
+            models = self.state_models(state)
+            survivors = models & self.formula_bits(elem)
+            if survivors:
+                self.states.append((survivors, self.size, True, state[3]))
+            elif state[3]:
+                self.states.append((models, self.size, False, True))
+            else:
+                if variables is None:
+                    variables = variables_of(new)
+                self.states.append((self.last_model(models, variables), self.size, False, True))
+        if common < self.kept:
+            self.kept = common
+        while self.kept < len(new) and self.states[self.kept + 1][2]:
+            self.kept += 1
+        if not isinstance(n_beliefset, BeliefStore):
+            self.store = None
+            return [elem for elem, state in zip(new, self.states[1:]) if state[2]]
+        beliefset = n_beliefset
+        if self.kept < len(new):
+            beliefset = n_beliefset.copy()
+            for i in range(len(new) - 1, self.kept - 1, -1):
+                if not self.states[i + 1][2]:
+                    beliefset.pop(i)
+        self.store, self.version = beliefset, beliefset.version
+        return beliefset
+
+    # What the last check did: the assignments where a formula was evaluated, the number of assignments
+    # and the number of models that are left (see BeliefSet.measure)
+    def work(self):
+        return self.evaluated * self.size, self.size, bin(self.state_models(self.states[-1])).count('1')
+
+    # Models of the last beliefset that was checked, without the variables that are not used anymore
+    # It returns the models, the masks of the variables and the number of assignments (like bitset_query needs)
+    def current(self):
+        models = self.state_models(self.states[-1])
+        masks = {}
+        for k, var in enumerate(self.table):
+            mask = self.variable_mask(var)
+            if self.count[var]:
+                masks[var] = mask
+            else:  # The variable can have any value
+                models = (models & ~mask) | ((models & mask) >> (1 << k))
+                models |= models << (1 << k)
+        return models, masks, self.size
+
+    # Models of the last beliefset that was checked (a ModelSet with only the variables that are used)
+    def model_set(self):
+        variables = variables_of(self.beliefs)
+        models, _, _ = self.current()
+        dead = [var for var in self.table if not self.count[var]]
+        return ModelSet(models, self.table, variables + dead).project(variables)
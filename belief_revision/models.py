@@ -0,0 +1,116 @@
+from .bitset import extend_models, swap_bits, remove_bit
+
+####################################################################################
+
+# MODEL SETS
+# A set of models without a dict for every model: the models are the bits of an int (see the bitset engine),
+# table[k] is the variable of the bit k and variables is the order of check_beliefset
+# It can still be used like the old list of dicts (models[0], for model in models, len(models), models == [...])
+class ModelSet():
+    def __init__(self, models, table, variables=None):
+        self.models = models
+        self.table = list(table)
+        self.variables = list(reversed(self.table)) if variables is None else list(variables)
+        self.size = 1 << len(self.table)
+        self.ordered = None  # The models in the order of variables (see ordered_models)
+        self.list_of_dicts = None
+
+    # Number of an assignment (a dict with all the variables)
+    def index(self, model):
+        i = 0
+        for k, var in enumerate(self.table):
+            if model[var]:
+                i |= 1 << k
+        return i
+
+    def __contains__(self, model):
+        return isinstance(model, dict) and self.models >> self.index(model) & 1 == 1
+
+    def __len__(self):
+        return bin(self.models).count('1')
+
+    def __bool__(self):
+        return self.models != 0
+
+    # The numbers of the models, from the lowest to the highest
+    def indices(self, models=None):
+        bits = bin(self.models if models is None else models)[:1:-1]  # bits[i] is the bit i
+        i = bits.find('1')
+        while i != -1:
+            yield i
+            i = bits.find('1', i + 1)
+
+    # The models with the first variable of check_beliefset in the highest bit, so their numbers are in the order
+    # of the old list of dicts (the bits are swapped only once, see reorder)
+    def ordered_models(self):
+        if self.ordered is None:
+            table = self.variables[::-1]
+            self.ordered = self.models if self.table == table else self.reorder(table).models
+        return self.ordered
+
+    # The models as dicts, in the same order as the old list of dicts (one by one, it's a generator)
+    def __iter__(self):
+        if self.list_of_dicts is not None:
+            yield from self.list_of_dicts
+            return
+        bits = list(enumerate(self.variables[::-1]))[::-1]
+        for i in self.indices(self.ordered_models()):
+            yield {var: bool(i >> k & 1) for k, var in bits}
+
+    # Compatibility view: the list of dicts that check_beliefset used to return
+    def dicts(self):
+        if self.list_of_dicts is None:
+            self.list_of_dicts = list(self)
+        return self.list_of_dicts
+
+    def __getitem__(self, i):
+        return self.dicts()[i]
+
+    def __eq__(self, other):
+        if isinstance(other, ModelSet):
+            if set(self.table) != set(other.table):
+                return False
+            return self.models == other.reorder(self.table).models
+        if isinstance(other, list):
+            return self.dicts() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self.dicts())
+
+    # Same models with the variables in other bits (table is the new order of the bits)
+    def reorder(self, table):
+        models, current = self.models, list(self.table)
+        for k, var in enumerate(table):
+            if current[k] != var:
+                j = current.index(var)
+                models = swap_bits(models, k, j, self.size)
+                current[k], current[j] = current[j], current[k]
+        return ModelSet(models, current, self.variables)
+
+    # Same models with new variables (that can have any value)
+    def extend(self, variables):
+        new = [var for var in variables if var not in self.table]
+        size = self.size << len(new)
+        return ModelSet(extend_models(self.models, self.size, size), self.table + new, self.variables + new)
+
+    # Models of both sets (if they have different variables, the models of both are extended first)
+    def intersection(self, other):
+        first = self.extend(other.variables)
+        second = other.extend(self.variables).reorder(first.table)
+        return ModelSet(first.models & second.models, first.table, first.variables)
+
+    __and__ = intersection
+
+    # Models with only some of the variables (the rest can have any value)
+    def project(self, variables):
+        keep = set(variables)
+        models, table, size = self.models, list(self.table), self.size
+        for k in range(len(table) - 1, -1, -1):
+            if table[k] not in keep:
+                models = remove_bit(models, k, size)
+                del table[k]
+                size >>= 1
+        return ModelSet(models, table, [var for var in self.variables if var in keep])
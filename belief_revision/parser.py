@@ -0,0 +1,154 @@
+from functools import lru_cache
+from collections import OrderedDict
+
+####################################################################################
+
+# Regular expressions for different patterns
+# Proposition
+pattern_proposition = r'^[a-z][0-9]*$'
+# Negation
+pattern_negation = r'^¬*[a-z][0-9]*$'
+# Implication (4 different patterns)
+pattern_imp_1_1 = r'^([a-z][0-9]*) (->) ([a-z][0-9]*)$'
+pattern_imp_1_2 = r'^(¬[a-z][0-9]*) (->) ([a-z][0-9]*)$'
+pattern_imp_1_3 = r'^([a-z][0-9]*) (->) (¬[a-z][0-9]*)$'
+pattern_imp_1_4 = r'^(¬[a-z][0-9]*) (->) (¬[a-z][0-9]*)$'
+# Or, And & If and only if
+pattern_or = r'^([a-z][0-9]*) (v) ([a-z][0-9]*)$'
+pattern_and = r'^([a-z][0-9]*) (\^) ([a-z][0-9]*)$'
+pattern_iff = r'^([a-z][0-9]*) (<->) ([a-z][0-9]*)$'
+# Same as before but with recursion (for formulas like (p -> q) -> (q ^ r) )
+pattern_negation2 = r'^(¬)\((.*)\)'
+pattern_imp2 = r'^(?=(?:[^()]*\([^()]*\))*[^()]*$)\((.*)\) (->) (?=(?:[^()]*\([^()]*\))*[^()]*$)\((.*)\)$'
+pattern_or2 = r'^(?=(?:[^()]*\([^()]*\))*[^()]*$)\((.*)\) (v) (?=(?:[^()]*\([^()]*\))*[^()]*$)\((.*)\)$'
+pattern_and2 = r'^(?=(?:[^()]*\([^()]*\))*[^()]*$)\((.*)\) (\^) (?=(?:[^()]*\([^()]*\))*[^()]*$)\((.*)\)$'
+pattern_iff2 = r'^(?=(?:[^()]*\([^()]*\))*[^()]*$)\((.*)\) (<->) (?=(?:[^()]*\([^()]*\))*[^()]*$)\((.*)\)$'
+# Expressions for all the operators
+pattern_binary_operators = r'^([a-z][0-9]*) (->|v|\^|<->) ([a-z][0-9]*)$'
+pattern_with_parenthesis = r'^(?=(?:[^()]*\([^()]*\))*[^()]*$)\((.*)\) (->|v|\^|<->) (?=(?:[^()]*\([^()]*\))*[^()]*$)\((.*)\)$'
+# Variables: a letter, optionally followed by a number (p, q, p1, p12,...)
+pattern_variable = r'[^\W\d_][0-9]*'
+
+####################################################################################
+
+# Compiled version of a pattern. A pattern is compiled the first time it is used (importing the module
+# doesn't compile anything, it doesn't even import re) and then the same compiled pattern is reused
+@lru_cache(maxsize=None)
+def regex(pattern):
+    import re
+    return re.compile(pattern)
+
+####################################################################################
+
+# PARSER
+# A formula is turned into a tree made of tuples, like 'p -> ¬q' = ('->', ('var', 'p'), ('¬', ('var', 'q')))
+# The nodes are:
+#   ('var', name), ('¬', x), ('->', x, y), ('v', x, y), ('^', x, y), ('<->', x, y)
+#   ('?', formula) for the formulas that don't match any pattern (they are always True, like before)
+# The trees are kept in an LRU cache, so every formula string is only parsed once
+
+@lru_cache(maxsize=1 << 16)
+def compile_formula(elem):
+    # Simple propositions and negations
+    if regex(pattern_proposition).match(elem):
+        return ('var', elem)
+    if regex(pattern_negation).match(elem):
+        return ('¬', ('var', elem[1:]))
+
+    # Implications (all of them), disjunctions, conjunctions and biconditionals
+    match = regex(pattern_imp_1_1).match(elem) or regex(pattern_imp_1_2).match(elem) or regex(pattern_imp_1_3).match(elem) or regex(pattern_imp_1_4).match(elem) \
+        or regex(pattern_or).match(elem) or regex(pattern_and).match(elem) or regex(pattern_iff).match(elem)
+    if match:
+        left, op, right = match.group(1), match.group(2), match.group(3)
+        return (op, compile_formula(left), compile_formula(right))
+
+    # More complex negated formulas
+    match = regex(pattern_negation2).match(elem)
+    if match:
+        return ('¬', compile_formula(match.group(2)))
+
+    # More complex implications, disjunctions, conjunctions and biconditionals
+    match = regex(pattern_imp2).match(elem) or regex(pattern_or2).match(elem) or regex(pattern_and2).match(elem) or regex(pattern_iff2).match(elem)
+    if match:
+        left, op, right = match.group(1), match.group(2), match.group(3)
+        return (op, compile_formula(left), compile_formula(right))
+
+    return ('?', elem)
+
+# Get the truth value of a tree based on a truth assignment (dic)
+def evaluate(tree, dic):
+    op = tree[0]
+    if op == 'var':
+        return dic[tree[1]] == True
+    if op == '¬':
+        return not evaluate(tree[1], dic)
+    if op == '?':
+        return True
+    left = evaluate(tree[1], dic)
+    right = evaluate(tree[2], dic)
+    if op == '->':
+        return not left or right
+    if op == 'v':
+        return left or right
+    if op == '^':
+        return left and right
+    return left == right
+
+# Check if the given formula is well defined (the result is cached for every formula)
+@lru_cache(maxsize=1 << 16)
+def well_defined(formula):
+    if regex(pattern_proposition).match(formula) or regex(pattern_negation).match(formula) or regex(pattern_imp_1_1).match(formula) or regex(pattern_imp_1_2).match(formula) or regex(pattern_imp_1_3).match(formula) or regex(pattern_imp_1_4).match(formula):   # If the formula is a basic proposition or negation
+        return True
+    match = regex(pattern_with_parenthesis).match(formula) or regex(pattern_binary_operators).match(formula)  # If the formula is like (p -> q) ^ (q v r) or like p -> q
+    if match:
+        return well_defined(match.group(1)) and well_defined(match.group(3))
+    return False
+
+####################################################################################
+
+# CANONICAL FORMS
+# 'p v q', 'q v p' and '(p) v (q)' are the same formula, so they get the same canonical tree:
+# double negations are removed and the two sides of v, ^ and <-> are sorted
+# The canonical trees are shared (hash-consing): two equal trees are the same object, so they can be
+# used as keys of the dicts that keep the masks, and equal subformulas are only evaluated once
+# The table is bounded like the other caches (the least recently used trees are removed first), so a long stream
+# of different formulas doesn't keep all of them: a tree that comes back after that is only a new object
+
+CANONICAL_TABLE_SIZE = 1 << 16
+
+canonical_table = OrderedDict()
+
+def hash_cons(tree):
+    shared = canonical_table.get(tree)
+    if shared is None:
+        shared = canonical_table[tree] = tree
+        if len(canonical_table) > CANONICAL_TABLE_SIZE:
+            canonical_table.popitem(last=False)
+    else:
+        canonical_table.move_to_end(tree)
+    return shared
+
+@lru_cache(maxsize=1 << 16)
+def canonical_tree(tree):
+    op = tree[0]
+    if op == 'var' or op == '?':
+        return hash_cons(tree)
+    if op == '¬':
+        inner = canonical_tree(tree[1])
+        if inner[0] == '¬':  # ¬¬x = x
+            return inner[1]
+        return hash_cons(('¬', inner))
+    left, right = canonical_tree(tree[1]), canonical_tree(tree[2])
+    if op != '->' and repr(right) < repr(left):
+        left, right = right, left
+    return hash_cons((op, left, right))
+
+# Canonical tree of a formula
+def canonical_formula(formula):
+    return canonical_tree(compile_formula(formula))
+
+# The formula that revision removes when a proposition is added (¬p for p and p for ¬p)
+def complement_of(proposition):
+    if proposition[0] == '¬':  # If it's ¬p, then ¬(¬p) = p
+        return proposition[1:]
+    return '¬' + proposition
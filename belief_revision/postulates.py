@@ -0,0 +1,76 @@
+from .beliefset import BeliefSet
+
+####################################################################################
+
+# AGM POSTULATES IN BULK
+# The postulate methods of BeliefSet change the beliefset they are given (and the beliefset of the BeliefSet), so the
+# result of a postulate depends on the ones checked before it. Here every postulate gets its own copy of the beliefset
+# and starts from an empty BeliefSet, but the same BeliefSet is used for all of them: the trees of the formulas are
+# only parsed once (see compile_formula) and, with the incremental engine, the masks of the formulas and the models
+# of the beliefset are computed once and shared by the nine postulates and by the cases with the same beliefset
+# The cases can also be split in batches and checked in a pool of processes
+
+POSTULATES = ['contraction_success', 'contraction_inclusion', 'contraction_vacuity', 'contraction_extensionality',
+              'revision_success', 'revision_inclusion', 'revision_vacuity', 'revision_consistency', 'revision_extensionality']
+
+# The extensionality postulates need two formulas
+EXTENSIONALITY = ('contraction_extensionality', 'revision_extensionality')
+
+# Postulates that a case doesn't satisfy. A case is a beliefset and a formula (and a second formula for the
+# extensionality postulates, if there isn't one the first formula is used again)
+# It returns two dicts: {postulate: ValueError} for the postulates that return an error and {postulate: exception}
+# for the ones that raise an exception
+def postulate_violations(bf, beliefset, prop1, prop2=None):
+    if prop2 is None:
+        prop2 = prop1
+    violations, errors = {}, {}
+    for name in POSTULATES:
+        bf.empty()
+        args = (beliefset.copy(), prop1, prop2) if name in EXTENSIONALITY else (beliefset.copy(), prop1)
+        try:
+            error = getattr(bf, name)(*args)
+        except Exception as exception:
+            errors[name] = exception
+            continue
+        if error is not None:
+            violations[name] = error
+    return violations, errors
+
+# Check the postulates for a batch of cases (first is the number of the first case)
+# It returns (number of the case, violations, errors) for every case, with the errors as strings
+def postulate_batch(cases, engine, incremental, first):
+    bf = BeliefSet(engine, incremental)
+    results = []
+    for i, case in enumerate(cases, first):
+        violations, errors = postulate_violations(bf, *case)
+        results.append((i, {name: str(error) for name, error in violations.items()},
+                        {name: repr(error) for name, error in errors.items()}))
+    return results
+
+# Check the nine postulates for many cases (in workers processes if workers > 0, in batches of batch cases)
+# The incremental engine is used by default with the bitset engine
+# It returns a summary: the number of cases, the number of violations and errors of every postulate and
+# the cases that failed ({'case': number of the case, 'violations': {...}, 'errors': {...}})
+def check_postulates(cases, engine='bitset', incremental=None, workers=0, batch=64):
+    if incremental is None:
+        incremental = engine == 'bitset'
+    cases = [tuple(case) for case in cases]
+    if workers:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(workers) as executor:
+            futures = [executor.submit(postulate_batch, cases[i:i + batch], engine, incremental, i)
+                       for i in range(0, len(cases), batch)]
+            results = [result for future in futures for result in future.result()]
+    else:
+        results = postulate_batch(cases, engine, incremental, 0)
+
+    summary = {'cases': len(cases), 'violations': dict.fromkeys(POSTULATES, 0), 'errors': dict.fromkeys(POSTULATES, 0),
+               'failures': []}
+    for i, violations, errors in results:
+        for name in violations:
+            summary['violations'][name] += 1
+        for name in errors:
+            summary['errors'][name] += 1
+        if violations or errors:
+            summary['failures'].append({'case': i, 'violations': violations, 'errors': errors})
+    return summary
@@ -0,0 +1,174 @@
+from .parser import canonical_formula
+from .store import BeliefStore, TreapNode, treap_size, treap_update, treap_split, treap_merge
+from .bitset import formula_variables, extend_models
+from .incremental import IncrementalModels
+
+####################################################################################
+
+# RANKED REVISION AND CONTRACTION
+# The position of a belief is its priority (its epistemic entrenchment): the first belief is the most entrenched one
+# A ranked revision by a formula keeps the formula and then every belief, from the first one to the last one,
+# that is consistent with the formula and the beliefs already kept (a maximal consistent subset by priority),
+# so only the least entrenched beliefs that cause a conflict are given up
+# A ranked contraction of a formula does the same starting from the negation of the formula, so the beliefs
+# that are left don't entail the formula anymore
+# The beliefs are kept in a treap where every node also has the models of all the beliefs of its subtree
+# (the & of their masks). The first belief that conflicts is found going down the tree once, which is a binary search
+# over the priorities (O(log n) instead of checking the beliefs one by one), and inserting or removing a belief
+# only updates the nodes above it. The masks of the variables and formulas are the ones of the incremental engine
+
+class RankedNode(TreapNode):
+    __slots__ = ('mask', 'meet', 'width')  # Mask of the formula, & of the masks of the subtree and their number of assignments
+
+class RankedModels(IncrementalModels):
+    def __init__(self):
+        super().__init__()
+        self.root = None
+        self.ranked = []  # Beliefs in the treap, in order
+        self.dropped = 0  # Beliefs that the last revision or contraction gave up
+
+    # A mask of width assignments with the current number of assignments
+    def widen(self, mask, width):
+        return extend_models(mask, width, self.size)
+
+    # Recompute the size and the & of the masks of the subtree of a node (see treap_split and treap_merge)
+    def update(self, node):
+        treap_update(node)
+        meet = mask = self.widen(node.mask, node.width)
+        for child in (node.left, node.right):
+            if child is not None:
+                meet &= self.widen(child.meet, child.width)
+        node.mask, node.meet, node.width = mask, meet, self.size
+
+    # Mask of a formula, adding its variables if they are new
+    def seed_bits(self, formula):
+        for var in formula_variables(formula):
+            if var not in self.masks:
+                self.add_variable(var)
+                self.count[var] = 0
+        return self.formula_bits(formula)
+
+    # Insert a belief in a position
+    def insert(self, i, formula):
+        node = RankedNode(formula)
+        node.mask = node.meet = self.seed_bits(formula)
+        node.width = self.size
+        for var in formula_variables(formula):
+            self.count[var] += 1
+        left, right = treap_split(self.root, i, self.update)
+        self.root = treap_merge(treap_merge(left, node, self.update), right, self.update)
+        self.ranked.insert(i, formula)
+
+    # Remove the belief in a position
+    def delete(self, i):
+        left, rest = treap_split(self.root, i, self.update)
+        node, right = treap_split(rest, 1, self.update)
+        self.root = treap_merge(left, right, self.update)
+        for var in formula_variables(node.formula):
+            self.count[var] -= 1
+        del self.ranked[i]
+
+    # Make the treap have the beliefs of n_beliefset, changing only the part between the first and the last
+    # belief that are different from the last time
+    # Nothing is compared if n_beliefset is the BeliefStore of the last revision or contraction and it didn't
+    # change since then (see BeliefStore.version)
+    def sync(self, n_beliefset):
+        if n_beliefset is not self.store or n_beliefset.version != self.version:
+            old, new = self.ranked, list(n_beliefset)
+            common, limit = 0, min(len(old), len(new))
+            while common < limit and old[common] == new[common]:
+                common += 1
+            suffix = 0
+            while suffix < limit - common and old[-1 - suffix] == new[-1 - suffix]:
+                suffix += 1
+            for i in range(len(old) - suffix - 1, common - 1, -1):
+                self.delete(i)
+            for i in range(common, len(new) - suffix):
+                self.insert(i, new[i])
+
+        live = sum(1 for var in self.table if self.count[var])
+        if len(self.table) - live > live:  # Too many variables that are not used anymore
+            beliefs = self.ranked
+            self.__init__()
+            for i, formula in enumerate(beliefs):
+                self.insert(i, formula)
+        elif len(self.formula_masks) > 2 * len(self.ranked) + 64:
+            used = {canonical_formula(formula) for formula in self.ranked}
+            self.formula_masks = {key: mask for key, mask in self.formula_masks.items() if key in used}
+
+    # Remember the beliefset of the last revision or contraction (see sync)
+    def synced(self, n_beliefset):
+        if isinstance(n_beliefset, BeliefStore):
+            self.store, self.version = n_beliefset, n_beliefset.version
+        else:
+            self.store = None
+
+    # First belief from the position start (in the subtree of node) that is False in all the models left, where
+    # models are the models of the beliefs kept before start
+    # It returns its position (None if there isn't any) and the models of the beliefs kept before it
+    def conflict(self, node, models, start):
+        if node is None:
+            return None, models
+        if start <= 0:  # All the subtree is kept if it has some model in common with the models left
+            survivors = models & self.widen(node.meet, node.width)
+            if survivors:
+                return None, survivors
+        left = treap_size(node.left)
+        if start < left:
+            position, models = self.conflict(node.left, models, start)
+            if position is not None:
+                return position, models
+        if start <= left:
+            survivors = models & self.widen(node.mask, node.width)
+            if not survivors:
+                return left, models
+            models = survivors
+        position, models = self.conflict(node.right, models, start - left - 1)
+        return (None if position is None else position + left + 1), models
+
+    # Positions of the beliefs that are given up to keep some of the models, from the most entrenched
+    # belief to the least entrenched one (only one search for every belief that is given up)
+    def give_up(self, models):
+        dropped, start = [], 0
+        while True:
+            position, models = self.conflict(self.root, models, start)
+            if position is None:
+                return dropped
+            dropped.append(position)
+            start = position + 1
+
+    # Remove the beliefs that are given up from n_beliefset (and from the treap)
+    def drop(self, n_beliefset, dropped):
+        self.dropped = len(dropped)
+        for position in reversed(dropped):
+            n_beliefset.pop(position)
+            self.delete(position)
+
+    # Ranked revision of n_beliefset by a formula, inserted at a priority (it changes n_beliefset and returns it)
+    def revise(self, n_beliefset, proposition, priority):
+        if not self.seed_bits(proposition):
+            raise ValueError('This formula is not satisfiable')
+        self.sync(n_beliefset)
+        if proposition in n_beliefset:  # It goes to its new priority
+            i = n_beliefset.index(proposition)
+            n_beliefset.pop(i)
+            self.delete(i)
+        self.drop(n_beliefset, self.give_up(self.seed_bits(proposition)))
+        n = len(n_beliefset)
+        i = min(max(priority + n if priority < 0 else priority, 0), n)
+        n_beliefset.insert(i, proposition)
+        self.insert(i, proposition)
+        self.synced(n_beliefset)
+        return n_beliefset
+
+    # Ranked contraction of a formula from n_beliefset (it changes n_beliefset and returns it)
+    # A formula that is always True can't be contracted, so then nothing is given up
+    def contract(self, n_beliefset, proposition):
+        self.sync(n_beliefset)
+        self.dropped = 0
+        mask = self.seed_bits(proposition)
+        models = ((1 << self.size) - 1) ^ mask
+        if models:
+            self.drop(n_beliefset, self.give_up(models))
+        self.synced(n_beliefset)
+        return n_beliefset
@@ -0,0 +1,389 @@
+from heapq import heappush, heappop
+
+from .parser import compile_formula, evaluate
+from .bitset import variables_of, formula_variables
+
+####################################################################################
+
+# SAT ENGINE
+# The truth tables need 2^n assignments, so with many variables the beliefset is checked with a SAT solver instead
+# The formulas are converted to CNF with the Tseitin transformation and the solver is a CDCL solver
+# (watched literals, unit propagation, clause learning, VSIDS heuristic and restarts)
+# Literals are given like in DIMACS: the variable 3 is 3 and its negation is -3
+# Inside the solver, the literal of the variable v is 2*v (positive) or 2*v+1 (negative)
+
+# Luby sequence (1, 1, 2, 1, 1, 2, 4, ...) used for the restarts
+def luby(y, x):
+    size, seq = 1, 0
+    while size < x + 1:
+        seq += 1
+        size = 2 * size + 1
+    while size - 1 != x:
+        size = (size - 1) >> 1
+        seq -= 1
+        x = x % size
+    return y ** seq
+
+class SatSolver():
+    def __init__(self):
+        self.num_vars = 0
+        self.clauses = []
+        self.watches = [[], []]  # For every literal, the clauses that are watching it
+        self.values = [-1, -1]   # For every literal: 1 True, 0 False, -1 not assigned
+        self.level = [0]
+        self.reason = [None]
+        self.activity = [0.0]
+        self.polarity = [1]      # Saved phase (1 means the variable is tried as False first)
+        self.seen = [False]
+        self.trail = []
+        self.trail_lim = []
+        self.qhead = 0
+        self.heap = []
+        self.increment = 1.0
+        self.ok = True
+        self.model = None
+
+    # Add a new variable and return it
+    def new_var(self):
+        self.num_vars += 1
+        self.watches += [[], []]
+        self.values += [-1, -1]
+        self.level.append(0)
+        self.reason.append(None)
+        self.activity.append(0.0)
+        self.polarity.append(1)
+        self.seen.append(False)
+        heappush(self.heap, (0.0, self.num_vars))
+        return self.num_vars
+
+    # Add a clause (a list of DIMACS literals). It returns False if the clauses can't be satisfied anymore
+    def add_clause(self, literals):
+        if not self.ok:
+            return False
+        self.cancel_until(0)
+        lits = set()
+        for lit in literals:
+            while abs(lit) > self.num_vars:
+                self.new_var()
+            lits.add(2 * abs(lit) + (lit < 0))
+        clause = []
+        for lit in lits:
+            if lit ^ 1 in lits or self.values[lit] == 1:  # The clause is always True
+                return True
+            if self.values[lit] == -1:
+                clause.append(lit)
+        if not clause:
+            self.ok = False
+        elif len(clause) == 1:
+            self.enqueue(clause[0], None)
+            self.ok = self.propagate() is None
+        else:
+            self.attach(clause)
+        return self.ok
+
+    def attach(self, clause):
+        self.clauses.append(clause)
+        index = len(self.clauses) - 1
+        self.watches[clause[0]].append(index)
+        self.watches[clause[1]].append(index)
+        return index
+
+    def enqueue(self, lit, reason):
+        self.values[lit] = 1
+        self.values[lit ^ 1] = 0
+        self.level[lit >> 1] = len(self.trail_lim)
+        self.reason[lit >> 1] = reason
+        self.trail.append(lit)
+
+    # Undo all the assignments above the given decision level
+    def cancel_until(self, level):
+        if len(self.trail_lim) > level:
+            values, activity = self.values, self.activity
+            for i in range(len(self.trail) - 1, self.trail_lim[level] - 1, -1):
+                lit = self.trail[i]
+                var = lit >> 1
+                values[lit] = values[lit ^ 1] = -1
+                self.reason[var] = None
+                self.polarity[var] = lit & 1
+                heappush(self.heap, (-activity[var], var))
+            del self.trail[self.trail_lim[level]:]
+            del self.trail_lim[level:]
+            self.qhead = len(self.trail)
+
+    # Unit propagation with two watched literals. It returns the index of a conflicting clause (or None)
+    def propagate(self):
+        values, clauses, watches, trail = self.values, self.clauses, self.watches, self.trail
+        while self.qhead < len(trail):
+            false_lit = trail[self.qhead] ^ 1
+            self.qhead += 1
+            ws = watches[false_lit]
+            i = j = 0
+            while i < len(ws):
+                index = ws[i]
+                clause = clauses[index]
+                i += 1
+                if clause[0] == false_lit:  # The false literal is always clause[1]
+                    clause[0], clause[1] = clause[1], false_lit
+                if values[clause[0]] == 1:
+                    ws[j] = index
+                    j += 1
+                    continue
+                for k in range(2, len(clause)):  # Look for a new literal to watch
+                    if values[clause[k]] != 0:
+                        clause[1], clause[k] = clause[k], false_lit
+                        watches[clause[1]].append(index)
+                        break
+                else:
+                    ws[j] = index
+                    j += 1
+                    if values[clause[0]] == 0:  # Conflict
+                        while i < len(ws):
+                            ws[j] = ws[i]
+                            j += 1
+                            i += 1
+                        del ws[j:]
+                        self.qhead = len(trail)
+                        return index
+                    self.enqueue(clause[0], index)
+            del ws[j:]
+        return None
+
+    def bump(self, var):
+        self.activity[var] += self.increment
+        if self.activity[var] > 1e100:
+            self.activity = [a * 1e-100 for a in self.activity]
+            self.increment *= 1e-100
+            self.heap = [(-self.activity[v], v) for v in range(1, self.num_vars + 1) if self.values[2 * v] == -1]
+            self.heap.sort()
+        elif self.values[2 * var] == -1:
+            heappush(self.heap, (-self.activity[var], var))
+
+    # Learn a clause from a conflict (first UIP). It returns the clause and the level to go back to
+    def analyze(self, conflict):
+        seen, level, trail = self.seen, self.level, self.trail
+        current = len(self.trail_lim)
+        learnt = [0]
+        counter = 0
+        lit = -1
+        i = len(trail) - 1
+        index = conflict
+        while True:
+            clause = self.clauses[index]
+            for k in range(0 if lit == -1 else 1, len(clause)):  # clause[0] is the literal that was implied
+                q = clause[k]
+                var = q >> 1
+                if not seen[var] and level[var] > 0:
+                    seen[var] = True
+                    self.bump(var)
+                    if level[var] >= current:
+                        counter += 1
+                    else:
+                        learnt.append(q)
+            while not seen[trail[i] >> 1]:
+                i -= 1
+            lit = trail[i]
+            i -= 1
+            seen[lit >> 1] = False
+            counter -= 1
+            if counter == 0:
+                break
+            index = self.reason[lit >> 1]
+        learnt[0] = lit ^ 1
+        for q in learnt[1:]:
+            seen[q >> 1] = False
+        if len(learnt) == 1:
+            return learnt, 0
+        best = max(range(1, len(learnt)), key=lambda k: level[learnt[k] >> 1])
+        learnt[1], learnt[best] = learnt[best], learnt[1]
+        return learnt, level[learnt[1] >> 1]
+
+    # Next variable to decide (the one with the highest activity)
+    def pick(self):
+        while self.heap:
+            activity, var = heappop(self.heap)
+            if self.values[2 * var] == -1 and -activity == self.activity[var]:
+                return var
+        return None
+
+    # Check if the clauses can be satisfied when the assumptions (DIMACS literals) are True
+    # If they can, self.model[v] is the value of the variable v
+    def solve(self, assumptions=()):
+        self.model = None
+        if not self.ok:
+            return False
+        self.cancel_until(0)
+        if self.propagate() is not None:
+            self.ok = False
+            return False
+        assumptions = [2 * abs(lit) + (lit < 0) for lit in assumptions]
+        for lit in assumptions:
+            while lit >> 1 > self.num_vars:
+                self.new_var()
+        conflicts, restarts = 0, 0
+        limit = 100 * luby(2, 0)
+        while True:
+            conflict = self.propagate()
+            if conflict is not None:
+                conflicts += 1
+                if not self.trail_lim:
+                    self.ok = False
+                    return False
+                learnt, level = self.analyze(conflict)
+                self.cancel_until(level)
+                if len(learnt) == 1:
+                    self.enqueue(learnt[0], None)
+                else:
+                    self.enqueue(learnt[0], self.attach(learnt))
+                self.increment /= 0.95
+                continue
+            if conflicts >= limit:
+                restarts += 1
+                limit = conflicts + 100 * luby(2, restarts)
+                self.cancel_until(0)
+                continue
+            level = len(self.trail_lim)
+            if level < len(assumptions):
+                lit = assumptions[level]
+                if self.values[lit] == 0:
+                    self.cancel_until(0)
+                    return False
+                self.trail_lim.append(len(self.trail))
+                if self.values[lit] == -1:
+                    self.enqueue(lit, None)
+                continue
+            var = self.pick()
+            if var is None:
+                self.model = [False] + [self.values[2 * v] == 1 for v in range(1, self.num_vars + 1)]
+                self.cancel_until(0)
+                return True
+            self.trail_lim.append(len(self.trail))
+            self.enqueue(2 * var + self.polarity[var], None)
+
+# Tseitin transformation: every subformula gets a new variable that is equivalent to it
+# The variables of the beliefs have to be added first (with add_variable), so a tree with an
+# unknown variable raises a KeyError like the other engines
+class TseitinEncoder():
+    def __init__(self, solver):
+        self.solver = solver
+        self.ids = {}
+        self.cache = {}
+        self.true = None
+
+    def add_variable(self, var):
+        if var not in self.ids:
+            self.ids[var] = self.solver.new_var()
+        return self.ids[var]
+
+    # Return a literal that is True exactly when the tree is True
+    def encode(self, tree):
+        if tree in self.cache:
+            return self.cache[tree]
+        op = tree[0]
+        if op == 'var':
+            return self.ids[tree[1]]
+        if op == '¬':
+            return -self.encode(tree[1])
+        if op == '?':  # The formulas that don't match any pattern are always True
+            if self.true is None:
+                self.true = self.solver.new_var()
+                self.solver.add_clause([self.true])
+            return self.true
+        a = self.encode(tree[1])
+        b = self.encode(tree[2])
+        g = self.solver.new_var()
+        add = self.solver.add_clause
+        if op == '->':
+            add([-g, -a, b]); add([g, a]); add([g, -b])
+        elif op == 'v':
+            add([-g, a, b]); add([g, -a]); add([g, -b])
+        elif op == '^':
+            add([-g, a]); add([-g, b]); add([g, -a, -b])
+        else:
+            add([-g, -a, b]); add([-g, a, -b]); add([g, a, b]); add([g, -a, -b])
+        self.cache[tree] = g
+        return g
+
+# Find the last model (in the order of check_beliefset) that satisfies the clauses:
+# every variable is True if it can be, starting from the first one
+def sat_last_model(solver, encoder, variables):
+    solver.solve()
+    model = solver.model
+    assumptions = []
+    for var in variables:
+        v = encoder.ids[var]
+        if not model[v]:
+            if solver.solve(assumptions + [v]):
+                model = solver.model
+            else:
+                assumptions.append(-v)
+                continue
+        assumptions.append(v)
+    return {var: model[encoder.ids[var]] for var in variables}
+
+# Same as BeliefSet.check_beliefset with a SAT solver
+# It returns the consistent beliefset, the solver and encoder with all the beliefs that were kept, and the variables
+# If a formula had to be removed, only the last model is left, so it also returns that model (or None)
+def sat_beliefset(n_beliefset):
+    beliefset = n_beliefset.copy()
+    variables = variables_of(n_beliefset)
+    solver = SatSolver()
+    encoder = TseitinEncoder(solver)
+    for var in variables:
+        encoder.add_variable(var)
+    last_model = None
+    for elem in n_beliefset:
+        tree = compile_formula(elem)
+        if last_model is not None:
+            if not evaluate(tree, last_model):
+                beliefset.remove(elem)
+            continue
+        lit = encoder.encode(tree)
+        if solver.solve([lit]):
+            solver.add_clause([lit])
+        else:
+            last_model = sat_last_model(solver, encoder, variables)
+            beliefset.remove(elem)
+    return beliefset, solver, encoder, variables, last_model
+
+# All the models of the beliefset, as the list of dicts that check_beliefset returns
+def sat_models_to_dicts(solver, encoder, variables, last_model):
+    if last_model is not None:
+        return [last_model]
+    list_of_dicts = []
+    while solver.solve():
+        model = {var: solver.model[encoder.ids[var]] for var in variables}
+        list_of_dicts.append(model)
+        if not variables or not solver.add_clause([-encoder.ids[var] if model[var] else encoder.ids[var] for var in variables]):
+            break
+    list_of_dicts.sort(key=lambda d: [d[var] for var in variables])
+    return list_of_dicts
+
+# Check the entailment of a formula with a beliefset that sat_beliefset already checked
+def sat_query(formula, solver, encoder, variables, last_model):
+    tree = compile_formula(formula)
+    formula_variables = variables_of([formula])
+
+    # First check if the formula can be True on its own (if it can't, check_beliefset keeps the model where everything is True)
+    alone = SatSolver()
+    alone_encoder = TseitinEncoder(alone)
+    for var in formula_variables:
+        alone_encoder.add_variable(var)
+    satisfiable = alone.solve([alone_encoder.encode(tree)])
+    known = set(variables)
+    common = [var for var in formula_variables if var in known]
+
+    if last_model is not None:  # Only one model is left in the beliefset
+        if not satisfiable:
+            return all(last_model[var] for var in common)
+        return alone.solve([alone_encoder.encode(tree)] + [alone_encoder.ids[var] if last_model[var] else -alone_encoder.ids[var] for var in common])
+
+    if not satisfiable:
+        return solver.solve([encoder.ids[var] for var in common])
+    for var in formula_variables:
+        encoder.add_variable(var)
+    return solver.solve([encoder.encode(tree)])
+
+# Same as Entailment.check_entailment with a SAT solver
+def sat_entailment(formula, n_beliefset):
+    _, solver, encoder, variables, last_model = sat_beliefset(n_beliefset)
+    return sat_query(formula, solver, encoder, variables, last_model)
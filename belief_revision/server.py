@@ -0,0 +1,273 @@
+'''
+
+QUERY SERVER
+
+Answers entailment queries from many clients over a TCP or a Unix socket:
+
+    python -m belief_revision.server --port 8765
+    python -m belief_revision.server --unix /tmp/belief_revision.sock --engine bitset --partition --workers 4
+
+Every request is a JSON line and gets a JSON line as answer (with the same "id", if the request has one):
+
+    {"id": 1, "op": "register", "base": "animals", "beliefs": ["p", "p -> q"]}
+                                        ->  {"id": 1, "base": "animals", "beliefs": 2}
+    {"id": 2, "op": "query", "base": "animals", "formula": "q"}
+                                        ->  {"id": 2, "entailed": true}
+    {"id": 3, "op": "drop", "base": "animals"}
+                                        ->  {"id": 3, "dropped": true}
+    {"id": 4, "op": "bases"}            ->  {"id": 4, "bases": {"animals": 2}}
+    {"id": 5, "op": "stats"}            ->  {"id": 5, "latency": {"queries": ..., "p50_ms": ..., "p99_ms": ...}, ...}
+
+The bases are registered with a name, and the first query checks the beliefset (a PreparedBase). The prepared
+bases are kept in a cache of --cache-size bases (the least recently used one is removed first), so the next
+queries only check the formula. Registering a base again replaces it. The same query (an equivalent formula on
+the same base) asked by many clients at the same time is only checked once, and so is a base that many queries
+need at the same time. The checks run in a pool of threads (and with --workers the bitset engine uses that number
+of processes), so the server keeps answering while a big base is checked. The requests of a connection are
+answered in the order they finish, so a client can send many of them without waiting
+The stats have the 50th and 99th percentiles of the time to answer the queries and the hit rates of the cache
+of bases and of the results of the queries
+
+'''
+
+####################################################################################
+
+import sys
+import json
+import time
+import asyncio
+import argparse
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+from .parser import canonical_formula
+from .beliefset import BeliefSet
+from .entailment import PreparedBase
+
+####################################################################################
+
+LATENCIES = 1 << 16  # Number of queries for the percentiles (the last ones)
+
+COUNTERS = ('requests', 'queries', 'errors', 'base_hits', 'base_misses', 'result_hits', 'result_misses',
+            'coalesced', 'evictions')
+
+# Value of the percentile p (0 to 100) of a list of values, with the nearest-rank method (None if it's empty)
+def percentile(values, p):
+    if not values:
+        return None
+    values = sorted(values)
+    rank = max(1, -(-p * len(values) // 100))  # ceil(p * n / 100)
+    return values[int(rank) - 1]
+
+class QueryServer():
+    def __init__(self, engine='bitset', partition=False, workers=0, chunk_size=1 << 16, cache_size=16, threads=4):
+        if cache_size < 1:
+            raise ValueError('The cache must have room for at least one base')
+        # All the bases are checked with the same BeliefSet (it's not incremental, so it doesn't keep any state
+        # between checks, only the processes of the workers)
+        self.bf = BeliefSet(engine, False, workers, chunk_size, partition)
+        if workers:
+            self.bf.processes()  # Started here, not by the first threads that need them
+        self.bases = {}                # {name: (version, beliefs)}
+        self.prepared = OrderedDict()  # {name: (version, PreparedBase, lock)}, the least recently used first
+        self.cache_size = cache_size
+        self.pending = {}              # Tasks of the bases and queries that are being checked
+        self.latencies = deque(maxlen=LATENCIES)
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.executor = ThreadPoolExecutor(threads)
+        self.version = 0
+
+    # The names of the bases are strings (a request can have anything there)
+    def check_name(self, name):
+        if not isinstance(name, str):
+            raise ValueError('The name of a base must be a string')
+
+    # Register a base (a list of formulas) with a name, replacing the base with the same name
+    def register(self, name, beliefs):
+        self.check_name(name)
+        if not isinstance(beliefs, list) or not all(isinstance(elem, str) for elem in beliefs):
+            raise ValueError('The beliefs must be a list of formulas')
+        self.version += 1
+        self.bases[name] = (self.version, list(beliefs))
+        self.prepared.pop(name, None)
+        return {'base': name, 'beliefs': len(beliefs)}
+
+    def drop(self, name):
+        self.check_name(name)
+        self.prepared.pop(name, None)
+        return {'dropped': self.bases.pop(name, None) is not None}
+
+    # Result of the task of a key, started with start() if there isn't one already, so the same check asked
+    # many times at once is only done once. It's shielded: a client that goes away doesn't cancel it for the rest
+    async def shared(self, key, start):
+        task = self.pending.get(key)
+        if task is None:
+            task = self.pending[key] = asyncio.ensure_future(start())
+            task.add_done_callback(lambda _: self.pending.pop(key, None))
+        else:
+            self.counters['coalesced'] += 1
+        return await asyncio.shield(task)
+
+    # Checked base of a name: (version, PreparedBase, lock), from the cache or checked in the pool of threads
+    async def base(self, name):
+        self.check_name(name)
+        if name not in self.bases:
+            raise ValueError('Unknown base: ' + str(name))
+        version, beliefs = self.bases[name]
+        entry = self.prepared.get(name)
+        if entry is not None and entry[0] == version:
+            self.counters['base_hits'] += 1
+            self.prepared.move_to_end(name)
+            return entry
+        self.counters['base_misses'] += 1
+        return await self.shared(('base', name, version), lambda: self.prepare(name, version, beliefs))
+
+    # Check a base in the pool of threads and keep it in the cache
+    async def prepare(self, name, version, beliefs):
+        loop = asyncio.get_running_loop()
+        prepared = await loop.run_in_executor(self.executor, PreparedBase, beliefs, self.bf)
+        entry = (version, prepared, asyncio.Lock())
+        if self.bases.get(name, (None,))[0] == version:  # It wasn't replaced or dropped in the meantime
+            self.prepared[name] = entry
+            self.prepared.move_to_end(name)
+            while len(self.prepared) > self.cache_size:
+                self.prepared.popitem(last=False)
+                self.counters['evictions'] += 1
+        return entry
+
+    # Entailment of a formula by the base of a name
+    async def query(self, name, formula):
+        self.check_name(name)
+        if not isinstance(formula, str):
+            raise ValueError('The formula must be a string')
+        self.counters['queries'] += 1
+        formula_key = canonical_formula(formula)
+        version, prepared, lock = await self.base(name)
+        if formula_key in prepared.results:  # Equivalent formulas have the same result
+            self.counters['result_hits'] += 1
+            return prepared.results[formula_key]
+        self.counters['result_misses'] += 1
+        return await self.shared(('query', name, version, formula_key), lambda: self.check(prepared, lock, formula))
+
+    # Check a formula in the pool of threads (only one at a time for every base, the SAT solver of a base
+    # can't be shared)
+    async def check(self, prepared, lock, formula):
+        loop = asyncio.get_running_loop()
+        async with lock:
+            return await loop.run_in_executor(self.executor, prepared.check_entailment, formula)
+
+    def stats(self):
+        latencies = list(self.latencies)
+        counters = self.counters
+        lookups = counters['base_hits'] + counters['base_misses']
+        results = counters['result_hits'] + counters['result_misses']
+        return {'latency': {'queries': len(latencies),
+                            'p50_ms': None if not latencies else 1000 * percentile(latencies, 50),
+                            'p99_ms': None if not latencies else 1000 * percentile(latencies, 99)},
+                'base_hit_rate': counters['base_hits'] / lookups if lookups else None,
+                'result_hit_rate': counters['result_hits'] / results if results else None,
+                'bases': len(self.bases), 'cached_bases': len(self.prepared), 'counters': dict(counters)}
+
+    # Answer of a request (a dict)
+    async def handle(self, request):
+        self.counters['requests'] += 1
+        start = time.perf_counter()
+        try:
+            if not isinstance(request, dict):
+                raise ValueError('A request must be a JSON object')
+            op = request.get('op')
+            if op == 'query':
+                answer = {'entailed': await self.query(request.get('base'), request.get('formula'))}
+                self.latencies.append(time.perf_counter() - start)
+            elif op == 'register':
+                answer = self.register(request.get('base'), request.get('beliefs'))
+            elif op == 'drop':
+                answer = self.drop(request.get('base'))
+            elif op == 'bases':
+                answer = {'bases': {name: len(beliefs) for name, (_, beliefs) in self.bases.items()}}
+            elif op == 'stats':
+                answer = self.stats()
+            else:
+                raise ValueError('Unknown operation: ' + str(op))
+        # Requests or formulas that are not written correctly (or anything else that goes wrong): the client
+        # always gets an answer
+        except Exception as error:
+            self.counters['errors'] += 1
+            answer = {'error': repr(error)}
+        if isinstance(request, dict) and 'id' in request:
+            answer = {'id': request['id'], **answer}
+        return answer
+
+    # Answer the requests of a connection, every one as soon as it's done
+    async def connection(self, reader, writer):
+        tasks = set()
+        async def respond(request):
+            answer = await self.handle(request)
+            writer.write(json.dumps(answer, ensure_ascii=False).encode('utf-8') + b'\n')
+            await writer.drain()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                except ValueError as error:
+                    self.counters['requests'] += 1
+                    self.counters['errors'] += 1
+                    request = None
+                    writer.write(json.dumps({'error': repr(error)}).encode('utf-8') + b'\n')
+                if request is not None:
+                    task = asyncio.ensure_future(respond(request))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except (ConnectionError, asyncio.CancelledError):  # The client is gone or the server is stopping
+            for task in tasks:
+                task.cancel()
+        finally:
+            writer.close()
+
+    # Serve on a Unix socket (path) or on a TCP port until it's cancelled
+    async def serve(self, host='127.0.0.1', port=8765, path=None, ready=None):
+        if path is not None:
+            server = await asyncio.start_unix_server(self.connection, path)
+        else:
+            server = await asyncio.start_server(self.connection, host, port)
+        if ready is not None:
+            ready(server)
+        async with server:
+            await server.serve_forever()
+
+    # Stop the threads and the processes of the workers
+    def close(self):
+        self.executor.shutdown()
+        self.bf.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Answer entailment queries over a socket (JSON lines)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', default=None, help='listen on this Unix socket instead of a TCP port')
+    parser.add_argument('--engine', default='bitset', choices=['bitset', 'truthtable', 'sat'])
+    parser.add_argument('--partition', action='store_true', help='check the components apart (bitset engine)')
+    parser.add_argument('--workers', type=int, default=0, help='processes for the bitset engine')
+    parser.add_argument('--threads', type=int, default=4, help='threads for the checks')
+    parser.add_argument('--cache-size', type=int, default=16, help='number of checked bases that are kept')
+    args = parser.parse_args(argv)
+    server = QueryServer(args.engine, args.partition, args.workers, cache_size=args.cache_size, threads=args.threads)
+    def ready(listener):
+        where = args.unix or '{}:{}'.format(*listener.sockets[0].getsockname()[:2])  # The real port with --port 0
+        print('Listening on', where, file=sys.stderr)
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix, ready))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+import zlib
+import struct
+
+from .parser import canonical_formula, hash_cons
+from .store import BeliefStore
+from .models import ModelSet
+from .entailment import PreparedBase
+
+####################################################################################
+
+# SNAPSHOTS
+# A snapshot keeps a beliefset that is already checked, so a new process can answer queries without parsing
+# the formulas and checking the beliefset again. It's a binary file (all the numbers are little endian):
+#   header      magic b'BRSN', version, flags, number of strings, nodes, beliefs and variables,
+#               bytes of the models and crc32 of everything after the header
+#   strings     length of every string (u32) and then all of them (utf-8): the variables, the beliefs and the
+#               formulas that don't match any pattern
+#   nodes       the canonical trees of the beliefs, one node after the other (op, a, b) with the children
+#               before their parents: a and b are nodes, a is a variable for 'var' and a string for '?'
+#   beliefs     (string, node of its tree) for every belief, in the order of the priorities
+#   table       the variable of every bit of the models (a string), and then the order of check_beliefset
+#               (the bit of every variable)
+#   models      the bitmap of the models (bit i is the assignment i, see the bitset engine), it starts at a
+#               multiple of 8 bytes
+# The file is memory-mapped when it is loaded, and the models are only read when they are needed
+
+MAGIC = b'BRSN'
+VERSION = 1
+HEADER = struct.Struct('<4sHHIIIIQI')
+NODE = struct.Struct('<BII')
+OPS = ('var', '¬', '->', 'v', '^', '<->', '?')
+
+# Contents of a snapshot of a beliefset and its models (a ModelSet or a list of dicts, like check_beliefset returns)
+def dump_snapshot(beliefset, models):
+    beliefs = list(beliefset)
+    if not isinstance(models, ModelSet):  # A list of dicts (the 'sat' and 'truthtable' engines)
+        variables = list(models[0]) if models else []  # All the variables (also the ones of the beliefs that were removed)
+        n = len(variables)
+        bits = 0
+        for model in models:
+            bits |= 1 << sum(1 << (n - 1 - k) for k, var in enumerate(variables) if model[var])
+        models = ModelSet(bits, variables[::-1], variables)
+
+    strings, string_index = [], {}
+    def string(text):
+        if text not in string_index:
+            string_index[text] = len(strings)
+            strings.append(text)
+        return string_index[text]
+    for var in models.table:
+        string(var)
+
+    nodes, node_index = [], {}
+    def node(tree):
+        if tree not in node_index:
+            op = tree[0]
+            if op == 'var' or op == '?':
+                a, b = string(tree[1]), 0
+            elif op == '¬':
+                a, b = node(tree[1]), 0
+            else:
+                a, b = node(tree[1]), node(tree[2])
+            node_index[tree] = len(nodes)
+            nodes.append(NODE.pack(OPS.index(op), a, b))
+        return node_index[tree]
+    entries = [struct.pack('<II', string(elem), node(canonical_formula(elem))) for elem in beliefs]
+
+    encoded = [text.encode('utf-8') for text in strings]
+    body = [struct.pack('<%dI' % len(encoded), *map(len, encoded)), b''.join(encoded), b''.join(nodes), b''.join(entries),
+            struct.pack('<%dI' % len(models.table), *(string_index[var] for var in models.table)),
+            struct.pack('<%dI' % len(models.variables), *(models.table.index(var) for var in models.variables))]
+    length = HEADER.size + sum(map(len, body))
+    body.append(b'\0' * (-length % 8))
+    bitmap = models.models.to_bytes((models.size + 7) // 8, 'little')
+    body.append(bitmap)
+    body = b''.join(body)
+    header = HEADER.pack(MAGIC, VERSION, 0, len(strings), len(nodes), len(beliefs), len(models.table), len(bitmap), zlib.crc32(body))
+    return header + body
+
+# Save a snapshot of the beliefset of the BeliefSet bf (or of the given beliefset) in a file
+def save_snapshot(path, bf, beliefset=None):
+    beliefset, models = bf.check_beliefset(bf.beliefset if beliefset is None else beliefset)
+    with open(path, 'wb') as f:
+        f.write(dump_snapshot(beliefset, models))
+
+# A snapshot read from a buffer (bytes or a memory-mapped file)
+# The strings, trees and beliefs are read when it is created, the models when they are used
+class Snapshot():
+    def __init__(self, buffer, verify=False):
+        self.source = buffer
+        self.buffer = memoryview(buffer)
+        if len(self.buffer) < HEADER.size:
+            raise ValueError('This is not a snapshot')
+        magic, version, _, n_strings, n_nodes, n_beliefs, n_variables, model_bytes, crc = HEADER.unpack_from(self.buffer)
+        if magic != MAGIC:
+            raise ValueError('This is not a snapshot')
+        if version != VERSION:
+            raise ValueError('Unsupported snapshot version: ' + str(version))
+        self.version = version
+        if verify and zlib.crc32(self.buffer[HEADER.size:]) != crc:
+            raise ValueError('The snapshot is corrupted')
+        try:
+            self.read(n_strings, n_nodes, n_beliefs, n_variables, model_bytes)
+        except (struct.error, IndexError, UnicodeDecodeError) as error:  # A section is cut short or points outside
+            raise ValueError('The snapshot is corrupted') from error
+
+    # Read the sections after the header
+    def read(self, n_strings, n_nodes, n_beliefs, n_variables, model_bytes):
+        offset = HEADER.size
+        lengths = struct.unpack_from('<%dI' % n_strings, self.buffer, offset)
+        offset += 4 * n_strings
+        strings = []
+        for length in lengths:
+            strings.append(str(self.section(offset, length), 'utf-8'))
+            offset += length
+
+        trees = []
+        for code, a, b in NODE.iter_unpack(self.section(offset, NODE.size * n_nodes)):
+            op = OPS[code]
+            if op == 'var' or op == '?':
+                tree = (op, strings[a])
+            elif op == '¬':
+                tree = (op, trees[a])
+            else:
+                tree = (op, trees[a], trees[b])
+            trees.append(hash_cons(tree))  # The same objects as the canonical trees of the formulas
+        offset += NODE.size * n_nodes
+
+        entries = list(struct.iter_unpack('<II', self.section(offset, 8 * n_beliefs)))
+        offset += 8 * n_beliefs
+        self.beliefs = [strings[text] for text, _ in entries]
+        self.trees = [trees[root] for _, root in entries]
+
+        self.table = [strings[i] for i in struct.unpack_from('<%dI' % n_variables, self.buffer, offset)]
+        offset += 4 * n_variables
+        self.variables = [self.table[k] for k in struct.unpack_from('<%dI' % n_variables, self.buffer, offset)]
+        offset += 4 * n_variables
+        offset += -offset % 8
+        self.size = 1 << n_variables
+        if model_bytes != (self.size + 7) // 8:
+            raise ValueError('The snapshot is corrupted')
+        self.bitmap = self.section(offset, model_bytes)  # The models are not copied
+        self.int_models = None
+
+    # The bytes of a section (a slice that is cut short by the end of the buffer means the file is corrupted)
+    def section(self, offset, length):
+        if offset + length > len(self.buffer):
+            raise ValueError('The snapshot is corrupted')
+        return self.buffer[offset:offset + length]
+
+    # The models as an int (they are read from the bitmap the first time)
+    @property
+    def models(self):
+        if self.int_models is None:
+            self.int_models = int.from_bytes(self.bitmap, 'little')
+        return self.int_models
+
+    # True if an assignment (a dict with all the variables) is a model, reading only its bit in the bitmap
+    def is_model(self, model):
+        i = 0
+        for k, var in enumerate(self.table):
+            if model[var]:
+                i |= 1 << k
+        return self.bitmap[i >> 3] >> (i & 7) & 1 == 1
+
+    def model_set(self):
+        return ModelSet(self.models, self.table, self.variables)
+
+    # The beliefset (its canonical forms are the trees of the snapshot, so the formulas are not parsed)
+    def beliefset(self):
+        return BeliefStore(self.beliefs, self.trees)
+
+    # A PreparedBase for the entailment of many formulas, with the models of the snapshot
+    def prepare(self, bf=None):
+        return PreparedBase(self.beliefset(), bf, self.model_set())
+
+    # Put the beliefset of the snapshot in the BeliefSet bf
+    def restore(self, bf):
+        bf.beliefset = self.beliefset()
+        return bf.beliefset
+
+    # Stop using the buffer (and close the file if it's memory-mapped)
+    def close(self):
+        self.bitmap.release()
+        self.buffer.release()
+        if hasattr(self.source, 'close'):
+            self.source.close()
+
+# Load a snapshot from a file. The file is memory-mapped (unless use_mmap is False), so the models are not read
+# until they are needed. With verify=True the crc32 of the file is checked too
+def load_snapshot(path, verify=False, use_mmap=True):
+    with open(path, 'rb') as f:
+        if not use_mmap:
+            return Snapshot(f.read(), verify)
+        import mmap
+        return Snapshot(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), verify)
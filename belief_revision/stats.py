@@ -0,0 +1,106 @@
+import time
+from functools import wraps
+from contextlib import contextmanager
+
+from .parser import compile_formula
+
+####################################################################################
+
+# INSTRUMENTATION
+# A BeliefSet (or an Entailment) with stats = Stats() keeps counters and timers for every operation
+# (expansion, contraction, revision, check_beliefset, check_entailment,...). With stats = None (the default)
+# the only cost is checking that attribute once per operation, nothing is counted or timed
+# An operation that calls others (a revision calls contraction and expansion) is only one operation: the ones
+# inside it add their counters and phases to it
+# When an operation finishes, its stats are a dict like this one, which is given to every callback:
+#   {'operation': 'revision', 'seconds': 0.0012,
+#    'phases': {'store': 0.0001, 'parse': 0.0002, 'bitset': 0.0008},
+#    'formulas_parsed': 1, 'assignments_evaluated': 48, 'models_pruned': 10, 'beliefs_dropped': 1}
+
+COUNTERS = ('formulas_parsed', 'assignments_evaluated', 'models_pruned', 'beliefs_dropped')
+
+class Stats():
+    def __init__(self, *callbacks):
+        self.callbacks = list(callbacks)
+        self.current = None  # Stats of the operation that is running
+        self.depth = 0
+        self.last = None     # Stats of the last operation
+        self.totals = {'operations': 0, 'seconds': 0.0, 'phases': {}}
+        self.totals.update(dict.fromkeys(COUNTERS, 0))
+
+    # Call fn(stats) every time an operation finishes
+    def add_callback(self, fn):
+        self.callbacks.append(fn)
+
+    @contextmanager
+    def operation(self, name):
+        self.depth += 1
+        if self.depth == 1:
+            self.current = {'operation': name, 'seconds': 0.0, 'phases': {}}
+            self.current.update(dict.fromkeys(COUNTERS, 0))
+            start = time.perf_counter()
+        try:
+            yield self.current
+        finally:
+            self.depth -= 1
+            if self.depth == 0:
+                stats = self.current
+                stats['seconds'] = time.perf_counter() - start
+                self.current, self.last = None, stats
+                self.add_totals(stats)
+                for fn in self.callbacks:
+                    fn(stats)
+
+    # Time a phase of the operation that is running (the time of a phase that happens more than once is added)
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            phases = self.current['phases']
+            phases[name] = phases.get(name, 0.0) + time.perf_counter() - start
+
+    # Parse a formula and count it if it wasn't parsed before (see compile_formula). Only the formula counts, not
+    # its subformulas. A formula that can't be parsed is left to the operation, that raises its own error
+    def parse(self, formula):
+        misses = compile_formula.cache_info().misses
+        try:
+            compile_formula(formula)
+        except Exception:
+            return
+        if compile_formula.cache_info().misses != misses:
+            self.current['formulas_parsed'] += 1
+
+    def count(self, name, n):
+        self.current[name] += n
+
+    def add_totals(self, stats):
+        totals = self.totals
+        totals['operations'] += 1
+        totals['seconds'] += stats['seconds']
+        for name in COUNTERS:
+            totals[name] += stats[name]
+        for name, seconds in stats['phases'].items():
+            totals['phases'][name] = totals['phases'].get(name, 0.0) + seconds
+
+    def reset(self):
+        self.__init__(*self.callbacks)
+
+# Decorator for the methods that are operations: with self.stats = None the method is just called
+# formula is the position of the argument that is a formula (@instrumented(formula=0)), it's parsed first
+def instrumented(method=None, formula=None):
+    if method is None:
+        return lambda method: instrumented(method, formula)
+    name = method.__name__
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        stats = self.stats
+        if stats is None:
+            return method(self, *args, **kwargs)
+        with stats.operation(name):
+            if formula is not None and formula < len(args):
+                with stats.phase('parse'):
+                    stats.parse(args[formula])
+            return method(self, *args, **kwargs)
+    return wrapper
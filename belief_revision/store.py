@@ -0,0 +1,251 @@
+import random
+from collections import deque
+from itertools import islice
+
+from .parser import canonical_formula, complement_of
+
+####################################################################################
+
+# BELIEF STORE
+# A beliefset that can be used like a list (insert, remove, in, iteration, indexing,...), but:
+# - 'in' looks in a dict of the canonical forms of the formulas, so it doesn't go through the whole list
+#   (and equivalent formulas like 'p v q' and 'q v p' are the same belief)
+# - The order (the priorities) is kept in a treap (a random binary tree where every node knows the size of its
+#   subtree), so inserting and removing at any position takes O(log n) instead of moving the rest of the list
+# - Every change counts as a new version and the positions of the last changes are kept, so the engines that
+#   keep something about a beliefset (see IncrementalModels and RankedModels) know what changed since they saw it
+
+# The priorities of the nodes come from their own generator, so building a beliefset doesn't change the numbers
+# of the random module (a program that uses random.seed gets the same numbers with or without beliefsets)
+priorities = random.Random()
+
+CHANGES = 64  # Number of changes whose positions are kept (see first_change)
+
+class TreapNode():
+    __slots__ = ('formula', 'priority', 'size', 'left', 'right', 'parent')
+
+    def __init__(self, formula):
+        self.formula = formula
+        self.priority = priorities.random()
+        self.size = 1
+        self.left = self.right = self.parent = None
+
+def treap_size(node):
+    return node.size if node is not None else 0
+
+# Recompute the size of a node and the parent of its children
+def treap_update(node):
+    node.size = 1 + treap_size(node.left) + treap_size(node.right)
+    if node.left is not None:
+        node.left.parent = node
+    if node.right is not None:
+        node.right.parent = node
+
+# Split a treap in the first k formulas and the rest
+# update recomputes what a node keeps about its subtree (treap_update only keeps the size, see RankedModels for more)
+def treap_split(node, k, update=treap_update):
+    if node is None:
+        return None, None
+    if treap_size(node.left) >= k:
+        left, node.left = treap_split(node.left, k, update)
+        update(node)
+        if left is not None:
+            left.parent = None
+        return left, node
+    node.right, right = treap_split(node.right, k - treap_size(node.left) - 1, update)
+    update(node)
+    if right is not None:
+        right.parent = None
+    return node, right
+
+# Join two treaps (all the formulas of a go before the ones of b)
+def treap_merge(a, b, update=treap_update):
+    if a is None or b is None:
+        root = a if b is None else b
+    elif a.priority > b.priority:
+        a.right = treap_merge(a.right, b, update)
+        update(a)
+        root = a
+    else:
+        b.left = treap_merge(a, b.left, update)
+        update(b)
+        root = b
+    if root is not None:
+        root.parent = None
+    return root
+
+class BeliefStore():
+    # keys are the canonical forms of the beliefs, if they are already known (like in a snapshot)
+    def __init__(self, beliefs=(), keys=None):
+        self.root = None
+        self.nodes = {}  # {canonical form: nodes of the formula}, there is more than one if the formula is repeated
+        self.version = 0  # Number of changes (insertions and removals)
+        self.changes = deque(maxlen=CHANGES)  # Positions of the last changes
+        # Build the treap from left to right, keeping the nodes of the right edge in a stack (it takes O(n))
+        stack = []
+        for i, formula in enumerate(beliefs):
+            node = TreapNode(formula)
+            self.nodes.setdefault(canonical_formula(formula) if keys is None else keys[i], []).append(node)
+            last = None
+            while stack and stack[-1].priority < node.priority:
+                last = stack.pop()
+                treap_update(last)
+            node.left = last
+            if stack:
+                stack[-1].right = node
+            stack.append(node)
+        self.root = stack[0] if stack else None
+        while stack:
+            treap_update(stack.pop())
+
+    def __len__(self):
+        return treap_size(self.root)
+
+    def __contains__(self, formula):
+        return canonical_formula(formula) in self.nodes
+
+    def __iter__(self):
+        return self.iterate()
+
+    # The formulas from a position to the end (the first one is found in O(log n), like in select)
+    def iterate(self, start=0):
+        stack, node = [], self.root
+        while node is not None:  # Keep the nodes of the path that go from the position on
+            left = treap_size(node.left)
+            if start <= left:
+                stack.append(node)
+                if start == left:
+                    break
+                node = node.left
+            else:
+                start -= left + 1
+                node = node.right
+        node = None
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.formula
+            node = node.right
+
+    # Position of a node in the order
+    def rank(self, node):
+        position = treap_size(node.left)
+        while node.parent is not None:
+            if node is node.parent.right:
+                position += treap_size(node.parent.left) + 1
+            node = node.parent
+        return position
+
+    # Node of a position
+    def select(self, i):
+        node = self.root
+        while True:
+            left = treap_size(node.left)
+            if i < left:
+                node = node.left
+            elif i == left:
+                return node
+            else:
+                i -= left + 1
+                node = node.right
+
+    def position(self, i):
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError('list index out of range')
+        return i
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            start, stop, step = i.indices(len(self))
+            if step == 1:
+                return list(islice(self.iterate(start), max(stop - start, 0)))
+            return list(self)[i]
+        return self.select(self.position(i)).formula
+
+    # Insert a formula in a position (like list.insert)
+    def insert(self, i, formula):
+        n = len(self)
+        if i < 0:
+            i = max(i + n, 0)
+        i = min(i, n)
+        node = TreapNode(formula)
+        self.nodes.setdefault(canonical_formula(formula), []).append(node)
+        left, right = treap_split(self.root, i)
+        self.root = treap_merge(treap_merge(left, node), right)
+        self.changed(i)
+
+    def append(self, formula):
+        self.insert(len(self), formula)
+
+    # Remove the formula in a position and return it (like list.pop)
+    def pop(self, i=-1):
+        i = self.position(i)
+        left, rest = treap_split(self.root, i)
+        node, right = treap_split(rest, 1)
+        self.root = treap_merge(left, right)
+        key = canonical_formula(node.formula)
+        nodes = self.nodes[key]
+        nodes.remove(node)
+        if not nodes:
+            del self.nodes[key]
+        self.changed(i)
+        return node.formula
+
+    def changed(self, i):
+        self.version += 1
+        self.changes.append(i)
+
+    # First position that can be different from the beliefset of a version (len(self) if it's the current one),
+    # or None if the changes since that version are not kept anymore
+    # A change at a position keeps all the beliefs before it, so it's the first position of all those changes
+    def first_change(self, version):
+        n = self.version - version
+        if n == 0:
+            return len(self)
+        if not 0 < n <= len(self.changes):
+            return None
+        return min(islice(reversed(self.changes), n))
+
+    def __delitem__(self, i):
+        self.pop(i)
+
+    # Position of the first time a formula (or an equivalent one) appears (like list.index)
+    def index(self, formula):
+        key = canonical_formula(formula)
+        if key not in self.nodes:
+            raise ValueError(repr(formula) + ' is not in list')
+        return min(self.rank(node) for node in self.nodes[key])
+
+    # Remove the first time a formula (or an equivalent one) appears (like list.remove)
+    def remove(self, formula):
+        if canonical_formula(formula) not in self.nodes:
+            raise ValueError('list.remove(x): x not in list')
+        self.pop(self.index(formula))
+
+    def count(self, formula):
+        return len(self.nodes.get(canonical_formula(formula), ()))
+
+    # The complement of a formula (see complement_of) as it is written in the beliefset, or None
+    def complement(self, formula):
+        proposition = complement_of(formula)
+        if proposition not in self:
+            return None
+        return self[self.index(proposition)]
+
+    def copy(self):
+        return BeliefStore(self)
+
+    def __eq__(self, other):
+        if isinstance(other, (BeliefStore, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(list(self))
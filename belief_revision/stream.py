@@ -0,0 +1,140 @@
+'''
+
+STREAMING PIPELINE
+
+Reads a log of operations (from a file or stdin) and applies them one by one to an incremental BeliefSet:
+
+    python -m belief_revision.stream operations.log --checkpoint 1000 > answers.jsonl
+
+Every line is one operation, written as text or as JSON:
+
+    expand 0 p -> q                 {"op": "expand", "formula": "p -> q", "priority": 0}
+    contract ¬q                     {"op": "contract", "formula": "¬q"}
+    revise 1 r                      {"op": "revise", "formula": "r", "priority": 1}
+    ranked_revise 0 (p) v (q)       {"op": "ranked_revise", "formula": "(p) v (q)", "priority": 0}
+    ranked_contract p               {"op": "ranked_contract", "formula": "p"}
+    query p -> r                    {"op": "query", "formula": "p -> r"}
+    checkpoint                      {"op": "checkpoint"}
+
+The priority is optional (expansions go to the end and revisions to the start without it). Empty lines and lines
+starting with # are skipped. The answers of the queries, the beliefset at the checkpoints, the errors and a summary
+with the number of operations per second are written as JSON lines. The log is read line by line, so the memory
+doesn't grow with its length
+
+'''
+
+####################################################################################
+
+import sys
+import json
+import time
+import argparse
+
+from .beliefset import BeliefSet
+from .entailment import Entailment
+
+####################################################################################
+
+OPERATIONS = ('expand', 'contract', 'revise', 'ranked_revise', 'ranked_contract', 'query', 'checkpoint')
+
+# Operation of a line of the log as a dict {'op': ..., 'formula': ..., 'priority': ...}, or None if there isn't any
+# The formula and the priority are None if they are not given
+def parse_operation(line):
+    line = line.strip()
+    if not line or line[0] == '#':
+        return None
+    if line[0] == '{':
+        operation = json.loads(line)
+        op, formula, priority = operation.get('op'), operation.get('formula'), operation.get('priority')
+    else:
+        op, _, rest = line.partition(' ')
+        first, _, formula = rest.strip().partition(' ')
+        priority = None
+        if first.lstrip('-').isdigit():  # The formulas never start with a number
+            priority = int(first)
+        else:
+            formula = rest.strip()
+        formula = formula.strip() or None
+    if op not in OPERATIONS:
+        raise ValueError('Unknown operation: ' + str(op))
+    if formula is None and op != 'checkpoint':
+        raise ValueError('The operation ' + op + ' needs a formula')
+    if formula is not None and not isinstance(formula, str):
+        raise ValueError('The formula must be a string')
+    if priority is not None and (not isinstance(priority, int) or isinstance(priority, bool)):
+        raise ValueError('The priority must be an integer')
+    return {'op': op, 'formula': formula, 'priority': priority}
+
+# Operations of the lines of a log, one by one (it's a generator)
+# A line that can't be read is given as {'op': 'error', 'error': message}
+# Every operation also has the number of its line
+def read_operations(lines):
+    for number, line in enumerate(lines, 1):
+        try:
+            operation = parse_operation(line)
+        except ValueError as error:  # json.JSONDecodeError is a ValueError too
+            yield {'op': 'error', 'line': number, 'error': str(error)}
+            continue
+        if operation is not None:
+            operation['line'] = number
+            yield operation
+
+# Apply the operations to the beliefset of bf (an incremental BeliefSet by default) and give the results one by one:
+#   {'op': 'query', 'line': ..., 'formula': ..., 'entailed': True/False}
+#   {'op': 'checkpoint', 'line': ..., 'operations': ..., 'beliefset': [...]} (also every checkpoint operations if it's not 0)
+#   {'op': 'error', 'line': ..., 'error': ...}
+#   {'op': 'summary', 'operations': ..., 'seconds': ..., 'ops_per_second': ..., 'beliefs': ...} at the end
+def run_stream(operations, bf=None, checkpoint=0):
+    if bf is None:
+        bf = BeliefSet(incremental=True)
+    et = Entailment()
+    et.beliefset = bf  # The queries use the same engine (and the same incremental models) as the operations
+    count, start = 0, time.perf_counter()
+    for operation in operations:
+        op, line = operation['op'], operation['line']
+        formula, priority = operation.get('formula'), operation.get('priority')
+        if op == 'error':
+            yield operation
+            continue
+        count += 1
+        try:
+            if op == 'expand':
+                bf.expansion(bf.beliefset, formula, len(bf.beliefset) if priority is None else priority)
+            elif op == 'contract':
+                bf.contraction(bf.beliefset, formula)
+            elif op == 'revise':
+                bf.revision(bf.beliefset, formula, priority or 0)
+            elif op == 'ranked_revise':
+                bf.ranked_revision(bf.beliefset, formula, priority or 0)
+            elif op == 'ranked_contract':
+                bf.ranked_contraction(bf.beliefset, formula)
+            elif op == 'query':
+                yield {'op': 'query', 'line': line, 'formula': formula, 'entailed': et.check_entailment(formula, bf.beliefset)}
+        except (ValueError, KeyError) as error:  # Formulas that are not written correctly
+            yield {'op': 'error', 'line': line, 'error': repr(error)}
+        if op == 'checkpoint' or (checkpoint and count % checkpoint == 0):
+            yield {'op': 'checkpoint', 'line': line, 'operations': count, 'beliefset': list(bf.beliefset)}
+    seconds = time.perf_counter() - start
+    yield {'op': 'summary', 'operations': count, 'seconds': seconds,
+           'ops_per_second': count / seconds if seconds else None, 'beliefs': len(bf.beliefset)}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Apply a log of belief revision operations and write the results as JSON lines')
+    parser.add_argument('log', nargs='?', default='-', help='file with the operations (- or nothing for stdin)')
+    parser.add_argument('--checkpoint', type=int, default=0, help='write the beliefset every this number of operations')
+    parser.add_argument('--engine', default='bitset', choices=['bitset', 'truthtable', 'sat'])
+    args = parser.parse_args(argv)
+    bf = BeliefSet(args.engine, incremental=args.engine == 'bitset')
+    log = sys.stdin if args.log == '-' else open(args.log, encoding='utf-8')
+    try:
+        for result in run_stream(read_operations(log), bf, args.checkpoint):
+            print(json.dumps(result, ensure_ascii=False))
+            if result['op'] == 'summary':
+                print('{} operations in {:.3f} s ({:.0f} operations per second)'.format(
+                    result['operations'], result['seconds'], result['ops_per_second'] or 0), file=sys.stderr)
+    finally:
+        if log is not sys.stdin:
+            log.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,246 @@
+'''
+
+BENCHMARK FOR THE BELIEFSET AND ENTAILMENT ENGINES
+
+It generates random beliefsets (always the same ones for the same seed) and measures how long
+check_beliefset, expansion, revision and check_entailment take with every engine, how much memory
+they need and how many models they go through. The results can be saved as JSON to compare
+engines or commits:
+
+    python benchmark.py --atoms 12 --beliefs 40 --depth 2 --queries 200 --output results.json
+
+Knobs:
+    --atoms     number of variables (more than 25 uses numbered variables, like p1, p2,...)
+    --beliefs   number of formulas in the beliefset
+    --depth     nesting depth of the formulas: 0 is 'p' or '¬p', 1 is 'p -> q', 2 is '(x) op (y)' or '¬(x)'
+                (2 is the deepest formula the parser accepts)
+    --queries   number of formulas for check_entailment
+
+It also measures how long it takes to import the package in a new interpreter. With --import-budget it fails
+(exit status 1) if it takes more than that number of milliseconds
+
+'''
+
+####################################################################################
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tracemalloc
+import subprocess
+
+from belief_revision import BeliefSet, Entailment, variables_of, well_defined, component_beliefset
+
+####################################################################################
+
+# RANDOM FORMULAS
+
+OPERATORS = ['->', 'v', '^', '<->']
+
+# Names of the variables: letters (without v) if there are few of them, numbered variables if not
+def make_atoms(n):
+    letters = [chr(c) for c in range(ord('a'), ord('z') + 1) if chr(c) != 'v']
+    if n <= len(letters):
+        return letters[:n]
+    return ['p' + str(i) for i in range(n)]
+
+def random_literal(rng, atoms):
+    atom = rng.choice(atoms)
+    return '¬' + atom if rng.random() < 0.5 else atom
+
+def random_simple(rng, atoms):
+    op = rng.choice(OPERATORS)
+    if op == '->':  # Implications are the only simple formulas that accept negations
+        return random_literal(rng, atoms) + ' -> ' + random_literal(rng, atoms)
+    return rng.choice(atoms) + ' ' + op + ' ' + rng.choice(atoms)
+
+# A formula with the given nesting depth
+def random_formula(rng, atoms, depth):
+    if depth <= 0:
+        return random_literal(rng, atoms)
+    if depth == 1:
+        return random_simple(rng, atoms)
+    if rng.random() < 0.2:
+        return '¬(' + random_simple(rng, atoms) + ')'
+    return '(' + random_simple(rng, atoms) + ') ' + rng.choice(OPERATORS) + ' (' + random_simple(rng, atoms) + ')'
+
+# A beliefset (the depth of every formula is between 0 and depth)
+def random_beliefset(rng, atoms, size, depth):
+    return [random_formula(rng, atoms, rng.randint(0, depth)) for _ in range(size)]
+
+####################################################################################
+
+# MEASUREMENTS
+
+# Run fn once with tracemalloc (for the peak memory) and repeat times without it (for the time)
+# It returns the best time, the peak memory in bytes and the result of the last run
+def measure(fn, repeat):
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, peak, result
+
+def make_beliefset(engine):
+    if engine == 'incremental':
+        return BeliefSet('bitset', incremental=True)
+    if engine == 'components':
+        return BeliefSet('bitset', partition=True)
+    return BeliefSet(engine)
+
+def make_entailment(engine):
+    if engine == 'incremental':
+        return Entailment('bitset', incremental=True)
+    if engine == 'components':
+        return Entailment('bitset', partition=True)
+    return Entailment(engine)
+
+# Maximum number of variables for every engine (the truth tables grow like 2^n)
+LIMITS = {'truthtable': 12, 'bitset': 24, 'incremental': 24, 'components': 24, 'sat': 10 ** 6}
+
+def bench_engine(engine, beliefs, expansions, revisions, queries, repeat):
+    results = []
+    # Assignments that the engine goes through: 2^n for the truth tables, the sum of 2^k of the components with
+    # the components engine and none with the sat engine
+    if engine == 'sat':
+        assignments = None
+    elif engine == 'components':
+        assignments = component_beliefset(beliefs)[1].work()[1]
+    else:
+        assignments = 1 << len(variables_of(beliefs))
+
+    # models are the models left by check_beliefset, entailed the number of queries that are entailed
+    def record(operation, ops, seconds, peak, models=None, entailed=None):
+        results.append({'engine': engine, 'operation': operation, 'ops': ops, 'seconds': seconds,
+                        'seconds_per_op': seconds / ops if ops else None, 'peak_bytes': peak,
+                        'assignments': assignments, 'models': models, 'entailed': entailed})
+
+    # check_beliefset on the whole beliefset (the sat engine only checks consistency, listing its models can take forever)
+    if engine == 'sat':
+        seconds, peak, _ = measure(lambda: make_beliefset(engine).check_consistency(beliefs), repeat)
+        record('check_consistency', 1, seconds, peak)
+    else:
+        seconds, peak, (_, models) = measure(lambda: make_beliefset(engine).check_beliefset(beliefs), repeat)
+        record('check_beliefset', 1, seconds, peak, len(models))
+
+    # Expansions one by one (with the priorities of the list)
+    def expand():
+        bs = make_beliefset(engine)
+        for proposition, priority in expansions:
+            bs.expansion(bs.beliefset, proposition, priority)
+        return bs
+    seconds, peak, bs = measure(expand, repeat)
+    record('expansion', len(expansions), seconds, peak)
+
+    # Revisions on the expanded beliefset
+    start = list(bs.beliefset)
+    def revise():
+        rs = make_beliefset(engine)
+        rs.beliefset = list(start)
+        for proposition, priority in revisions:
+            rs.revision(rs.beliefset, proposition, priority)
+        return rs
+    seconds, peak, _ = measure(revise, repeat)
+    record('revision', len(revisions), seconds, peak)
+
+    # Entailment, one formula at a time and all at once
+    def entail():
+        et = make_entailment(engine)
+        return [et.check_entailment(formula, beliefs) for formula in queries]
+    seconds, peak, answers = measure(entail, repeat)
+    record('check_entailment', len(queries), seconds, peak, entailed=sum(answers))
+
+    def entail_many():
+        return list(make_entailment(engine).check_entailment_many(queries, beliefs))
+    seconds, peak, answers = measure(entail_many, repeat)
+    record('check_entailment_many', len(queries), seconds, peak, entailed=sum(answers))
+    return results
+
+# Time to import the package in a new interpreter (the best of repeat runs, in seconds)
+# Only the import is timed, not the start of the interpreter
+IMPORT_TIMER = 'import time; start = time.perf_counter(); import belief_revision; print(time.perf_counter() - start)'
+
+def measure_import(repeat):
+    times = []
+    for _ in range(max(1, repeat)):
+        output = subprocess.run([sys.executable, '-c', IMPORT_TIMER], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+        times.append(float(output))
+    return min(times)
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+def run(args):
+    rng = random.Random(args.seed)
+    atoms = make_atoms(args.atoms)
+    beliefs = random_beliefset(rng, atoms, args.beliefs, args.depth)
+    # expansion raises an error for the formulas that are not well defined (like '¬(x)'), so they are not used
+    expansions = [formula for formula in random_beliefset(rng, atoms, args.beliefs, args.depth) if well_defined(formula)]
+    expansions = [(formula, rng.randint(0, i)) for i, formula in enumerate(expansions)]
+    revisions = [(random_literal(rng, atoms), rng.randint(0, args.beliefs)) for _ in range(max(1, args.beliefs // 4))]
+    queries = random_beliefset(rng, atoms, args.queries, args.depth)
+    n = len(variables_of(beliefs))
+
+    import_seconds = measure_import(args.repeat)
+    if args.import_budget is None:
+        print('Import time: {:.1f} ms'.format(1000 * import_seconds))
+    else:
+        print('Import time: {:.1f} ms (budget {:g} ms)'.format(1000 * import_seconds, args.import_budget))
+
+    results = []
+    for engine in args.engines:
+        if n > LIMITS[engine]:
+            print('Skipping', engine, '(' + str(n), 'variables, the limit is', str(LIMITS[engine]) + ')')
+            continue
+        results += bench_engine(engine, beliefs, expansions, revisions, queries, args.repeat)
+
+    print('{:<12} {:<22} {:>6} {:>12} {:>14} {:>12} {:>10} {:>10}'.format(
+        'engine', 'operation', 'ops', 'ms/op', 'peak KiB', 'assignments', 'models', 'entailed'))
+    for r in results:
+        print('{:<12} {:<22} {:>6} {:>12.4f} {:>14.1f} {:>12} {:>10} {:>10}'.format(
+            r['engine'], r['operation'], r['ops'], 1000 * r['seconds_per_op'], r['peak_bytes'] / 1024,
+            *('-' if r[key] is None else r[key] for key in ('assignments', 'models', 'entailed'))))
+
+    report = {'config': vars(args), 'variables': n, 'python': platform.python_version(), 'commit': git_commit(),
+              'import_seconds': import_seconds,
+              'import_within_budget': None if args.import_budget is None else 1000 * import_seconds <= args.import_budget,
+              'results': results}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print('Results saved in', args.output)
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark for the BeliefSet and Entailment engines')
+    parser.add_argument('--atoms', type=int, default=10, help='number of variables')
+    parser.add_argument('--beliefs', type=int, default=20, help='number of formulas in the beliefset')
+    parser.add_argument('--depth', type=int, default=2, choices=[0, 1, 2], help='nesting depth of the formulas')
+    parser.add_argument('--queries', type=int, default=50, help='number of formulas for check_entailment')
+    parser.add_argument('--engines', nargs='+', default=['truthtable', 'bitset', 'incremental', 'components', 'sat'], choices=sorted(LIMITS))
+    parser.add_argument('--repeat', type=int, default=3, help='times every measurement is repeated (the best time is kept)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='JSON file for the results')
+    parser.add_argument('--import-budget', type=float, default=None,
+                        help='maximum time to import the package (in ms), it fails if it takes longer')
+    return run(parser.parse_args(argv))
+
+if __name__ == '__main__':
+    report = main()
+    if report['import_within_budget'] is False:
+        print('The import takes more than the budget')
+        sys.exit(1)
@@ -0,0 +1,196 @@
+'''
+
+DIFFERENTIAL TESTS OF THE ENGINES
+
+The engines (truthtable, bitset, incremental, components and sat) are compared with the truth table check of the
+first version of the project, written again here (reference_beliefset and reference_entailment), on random
+beliefsets. The SAT solver is compared with a brute force search on random sets of clauses
+
+    python -m pytest -q tests
+    python tests/test_engines.py
+
+'''
+
+####################################################################################
+
+import os
+import re
+import sys
+import random
+import itertools
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from belief_revision import BeliefSet, Entailment, SatSolver, compile_formula, evaluate
+
+####################################################################################
+
+# Letters and numbered variables (a letter followed by a number, like 'p1' or 'q12')
+VARIABLES = ['p', 'q', 'r', 's', 't', 'u', 'w', 'p1', 'p2', 'q12', 'w3']
+
+ENGINES = [('truthtable', False, False), ('bitset', False, False), ('bitset', True, False),
+           ('bitset', False, True), ('sat', False, False)]
+
+# Truth table check of the first version: the beliefs are checked in their order, a belief that is False in all
+# the models left is removed and a model is only removed while there is more than one
+def reference_beliefset(n_beliefset):
+    variables = []
+    for elem in n_beliefset:
+        for var in re.findall(r'[a-z][0-9]*', elem):
+            if var not in variables and var != 'v':
+                variables.append(var)
+    list_of_dicts = [dict(zip(variables, combo)) for combo in itertools.product([False, True], repeat=len(variables))]
+    beliefset = n_beliefset.copy()
+    list_copy = list_of_dicts.copy()
+    for elem in n_beliefset:
+        corroboration = []
+        for d in list_copy:
+            if d in list_of_dicts:
+                f = evaluate(compile_formula(elem), d)
+                corroboration.append(f)
+                if f == False and len(list_of_dicts) > 1:
+                    list_of_dicts.remove(d)
+        if all(not x for x in corroboration):
+            beliefset.remove(elem)
+    return beliefset, list_of_dicts
+
+# Entailment of the first version: some model of the formula agrees with some model of the beliefset on the
+# variables that they share
+def reference_entailment(formula, n_beliefset):
+    base_models = reference_beliefset(n_beliefset)[1]
+    formula_models = reference_beliefset([formula])[1]
+    return any(all(tf_form[key] == tf[key] for key in tf if key in tf_form)
+               for tf in formula_models for tf_form in base_models)
+
+# A simple formula ('p', '¬p', 'p -> q', 'p v q',...) with the given variables
+def simple_formula(rng, variables):
+    a, b = rng.choice(variables), rng.choice(variables)
+    return rng.choice([a, '¬' + a, a + ' -> ' + b, '¬' + a + ' -> ' + b, a + ' -> ¬' + b, '¬' + a + ' -> ¬' + b,
+                       a + ' v ' + b, a + ' ^ ' + b, a + ' <-> ' + b])
+
+# A simple formula or a complex one ('¬(x)', '(x) -> (y)',...)
+def random_formula(rng, variables):
+    k = rng.randrange(6)
+    if k < 3:
+        return simple_formula(rng, variables)
+    if k == 3:
+        return '¬(' + simple_formula(rng, variables) + ')'
+    op = rng.choice(['->', 'v', '^', '<->'])
+    return '(' + simple_formula(rng, variables) + ') ' + op + ' (' + simple_formula(rng, variables) + ')'
+
+def random_beliefset(rng):
+    variables = rng.sample(VARIABLES, rng.randint(1, 5))
+    return [random_formula(rng, variables) for _ in range(rng.randint(0, 8))], variables
+
+####################################################################################
+
+def test_check_beliefset():
+    rng = random.Random(1)
+    for _ in range(200):
+        n_beliefset, _ = random_beliefset(rng)
+        expected = reference_beliefset(n_beliefset)
+        for engine, incremental, partition in ENGINES:
+            bf = BeliefSet(engine, incremental, partition=partition)
+            beliefset, models = bf.check_beliefset(n_beliefset)
+            assert beliefset == expected[0], (engine, incremental, partition, n_beliefset)
+            assert models == expected[1], (engine, incremental, partition, n_beliefset)
+            assert bf.check_consistency(n_beliefset) == expected[0], (engine, incremental, partition, n_beliefset)
+
+def test_check_entailment():
+    rng = random.Random(2)
+    for _ in range(200):
+        n_beliefset, variables = random_beliefset(rng)
+        formula = random_formula(rng, variables + [rng.choice(VARIABLES)])
+        expected = reference_entailment(formula, n_beliefset)
+        for engine, incremental, partition in ENGINES:
+            entailment = Entailment(engine, incremental, partition=partition)
+            assert entailment.check_entailment(formula, n_beliefset) == expected, \
+                (engine, incremental, partition, formula, n_beliefset)
+
+# The incremental engine keeps its models between checks, so it's also checked on a beliefset that changes
+def test_incremental_updates():
+    rng = random.Random(3)
+    bf = BeliefSet('bitset', True)
+    entailment = Entailment('bitset', True)
+    n_beliefset = []
+    for _ in range(300):
+        if n_beliefset and rng.random() < 0.3:
+            del n_beliefset[rng.randrange(len(n_beliefset))]
+        else:
+            n_beliefset.insert(rng.randint(0, len(n_beliefset)), random_formula(rng, VARIABLES[4:10]))
+        assert bf.check_beliefset(n_beliefset) == reference_beliefset(n_beliefset), n_beliefset
+        formula = random_formula(rng, VARIABLES)
+        assert entailment.check_entailment(formula, n_beliefset) == reference_entailment(formula, n_beliefset)
+
+# With a BeliefStore the incremental engine only reads the beliefs after the first position that changed since
+# the store it returned, so the store is changed in place here (and by the expansions and contractions)
+def test_incremental_store():
+    rng = random.Random(5)
+    bf = BeliefSet('bitset', True)
+    for _ in range(300):
+        formula = simple_formula(rng, VARIABLES[4:10])
+        k = rng.randrange(4)
+        if k == 0 and len(bf.beliefset):
+            bf.beliefset.pop(rng.randrange(len(bf.beliefset)))
+            n_beliefset = list(bf.beliefset)
+            bf.beliefset = bf.check_consistency(bf.beliefset)
+        elif k == 1:  # The contraction doesn't check the beliefset again
+            bf.contraction(bf.beliefset, formula)
+            n_beliefset = list(bf.beliefset)
+        elif formula not in bf.beliefset:
+            i = rng.randint(0, len(bf.beliefset))
+            n_beliefset = list(bf.beliefset)
+            n_beliefset.insert(i, formula)
+            bf.expansion(bf.beliefset, formula, i)
+        else:
+            continue
+        if k != 1:
+            assert list(bf.beliefset) == reference_beliefset(n_beliefset)[0], n_beliefset
+        beliefset, models = bf.check_beliefset(bf.beliefset)
+        assert (list(beliefset), models) == reference_beliefset(list(bf.beliefset)), n_beliefset
+
+# The numbered variables are variables on their own ('p1' is not 'p'), with every engine
+def test_numbered_variables():
+    for engine, incremental, partition in ENGINES:
+        bf = BeliefSet(engine, incremental, partition=partition)
+        assert bf.check_beliefset(['p1', 'p1 -> q2']) == (['p1', 'p1 -> q2'], [{'p1': True, 'q2': True}])
+        assert bf.check_beliefset(['p', '¬p1', 'p12 v p']) == reference_beliefset(['p', '¬p1', 'p12 v p'])
+        entailment = Entailment(engine, incremental, partition=partition)
+        assert entailment.check_entailment('q2', ['p1']) == reference_entailment('q2', ['p1'])
+        assert entailment.check_entailment('¬q2', ['p1', 'p1 -> q2']) is False
+
+####################################################################################
+
+# Brute force: some assignment of the n variables satisfies all the clauses and the assumptions
+def brute_force(clauses, n, assumptions=()):
+    for bits in itertools.product([False, True], repeat=n):
+        if all(any(bits[abs(lit) - 1] == (lit > 0) for lit in clause) for clause in list(clauses) + [[lit] for lit in assumptions]):
+            return True
+    return False
+
+def test_sat_solver():
+    rng = random.Random(4)
+    for _ in range(300):
+        n = rng.randint(1, 10)
+        clauses = [[rng.choice([-1, 1]) * rng.randint(1, n) for _ in range(rng.randint(1, 3))]
+                   for _ in range(int(n * rng.uniform(1, 5)))]
+        assumptions = [rng.choice([-1, 1]) * rng.randint(1, n) for _ in range(rng.randint(0, 2))]
+        solver = SatSolver()
+        for clause in clauses:
+            solver.add_clause(clause)
+        result = solver.solve(assumptions)
+        assert result == brute_force(clauses, n, assumptions), (clauses, assumptions)
+        if result:
+            model = solver.model
+            assert all(any(model[abs(lit)] == (lit > 0) for lit in clause) for clause in clauses)
+            assert all(model[abs(lit)] == (lit > 0) for lit in assumptions)
+        # The assumptions don't stay: the solver can be used again without them
+        assert solver.solve() == brute_force(clauses, n), clauses
+
+####################################################################################
+
+if __name__ == '__main__':
+    for test in (test_check_beliefset, test_check_entailment, test_incremental_updates, test_incremental_store,
+                 test_numbered_variables, test_sat_solver):
+        test()
+        print(test.__name__, 'ok')